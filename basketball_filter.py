@@ -0,0 +1,151 @@
+import string
+from collections import namedtuple
+
+# Basketball-related keywords for content filtering
+BASKETBALL_KEYWORDS = [
+    'basketball', 'nba', 'wnba', 'ncaa', 'player', 'team', 'coach', 'shooting', 'defense', 'offense',
+    'dribble', 'pass', 'rebound', 'assist', 'block', 'steal', 'turnover', 'court', 'foul', 'free throw',
+    'jump shot', 'layup', 'dunk', 'three-pointer', 'pick and roll', 'fast break', 'zone defense',
+    'man-to-man', 'basketball analytics', 'player efficiency', 'true shooting', 'effective field goal',
+    'usage rate', 'defensive rating', 'offensive rating', 'plus-minus', 'box plus-minus', 'win shares',
+    'vorp', 'per', 'pace', 'possession', 'basketball strategy', 'basketball statistics', 'basketball metrics'
+]
+
+# Words and phrases that mark a response as a recommendation
+RECOMMENDATION_CUES = [
+    'recommend', 'recommends', 'recommended', 'recommending', 'recommendation', 'recommendations',
+    'suggest', 'suggests', 'suggested', 'suggesting', 'suggestion', 'suggestions',
+    'advice',
+    'consider', 'considers', 'considered', 'considering', 'consideration', 'considerations',
+    'you could try', 'you should try', 'you might try'
+]
+
+REDIRECT_MESSAGE = (f"I'd like to focus our conversation on basketball. "
+                    f"For basketball-related recommendations, I suggest exploring topics like "
+                    f"player development metrics, advanced statistical analysis, or team strategy optimization. "
+                    f"What specific aspect of basketball would you like recommendations on?")
+
+# Simple inflections accepted on a keyword's last word ("players", "passing", "blocked")
+KEYWORD_SUFFIXES = ('', 's', 'es', 'ed', 'ing')
+
+# Characters normalized per scanning step; small enough that on-topic text exits early
+SCAN_CHUNK_CHARS = 1024
+
+BasketballScan = namedtuple("BasketballScan", ["keywords", "cues"])
+
+# Punctuation (including hyphens and typographic quotes/dashes) becomes a word break,
+# so "man-to-man" normalizes to "man to man" and "player's" still yields "player"
+_WORD_BREAKS = str.maketrans({ch: " " for ch in string.punctuation + "–—‘’“”…"})
+
+
+def _normalize(text):
+    return text.lower().translate(_WORD_BREAKS).split()
+
+
+def _build_matcher(terms, suffixes):
+    # Single words are matched by set lookup on whole tokens; phrases are indexed by their
+    # first word and confirmed against the space-joined token stream only when that word appears
+    words = {}
+    phrases = {}
+    for term in terms:
+        parts = _normalize(term)
+        for suffix in suffixes:
+            variant = parts[:-1] + [parts[-1] + suffix]
+            if len(variant) == 1:
+                words.setdefault(variant[0], term)
+            else:
+                phrases.setdefault(variant[0], []).append((f" {' '.join(variant)} ", term))
+    return words, phrases
+
+
+# Built once at import; matching is then a constant number of passes over the text
+# no matter how many keywords there are, and only whole words count
+# ("per" no longer matches inside "super", nor "pace" inside "space")
+_KEYWORD_WORDS, _KEYWORD_PHRASES = _build_matcher(BASKETBALL_KEYWORDS, KEYWORD_SUFFIXES)
+_CUE_WORDS, _CUE_PHRASES = _build_matcher(RECOMMENDATION_CUES, ('',))
+_MAX_PHRASE_WORDS = max(len(_normalize(term)) for term in BASKETBALL_KEYWORDS + RECOMMENDATION_CUES)
+
+
+def _match(scanned, words, phrases, first_only):
+    matched = set()
+    for token in scanned.token_set.intersection(words):
+        matched.add(words[token])
+        if first_only:
+            return matched
+    for first_word in scanned.token_set.intersection(phrases):
+        for phrase, term in phrases[first_word]:
+            if term not in matched and phrase in scanned.joined:
+                matched.add(term)
+                if first_only:
+                    return matched
+    return matched
+
+
+class _ScannedText:
+    # Normalized views of a piece of text, computed once and shared by keyword and cue matching
+    __slots__ = ("tokens", "token_set", "_joined")
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.token_set = set(tokens)
+        self._joined = None
+
+    @property
+    def joined(self):
+        if self._joined is None:
+            self._joined = f" {' '.join(self.tokens)} "
+        return self._joined
+
+    def keywords(self, first_only=False):
+        return _match(self, _KEYWORD_WORDS, _KEYWORD_PHRASES, first_only)
+
+    def cues(self, first_only=False):
+        return _match(self, _CUE_WORDS, _CUE_PHRASES, first_only)
+
+
+def _scan_chunks(text):
+    # Long responses are scanned in word-aligned chunks so an on-topic answer stops at its first keyword.
+    # Each chunk carries the previous chunk's last few words so phrases spanning the split still match.
+    start = 0
+    carry = []
+    while start < len(text):
+        end = start + SCAN_CHUNK_CHARS
+        if end < len(text):
+            space = text.find(" ", end)
+            end = len(text) if space == -1 else space
+        tokens = _normalize(text[start:end])
+        yield _ScannedText(carry + tokens)
+        carry = tokens[-(_MAX_PHRASE_WORDS - 1):]
+        start = end
+
+
+# Function to check if content is basketball-related
+def is_basketball_related(content):
+    return any(chunk.keywords(first_only=True) for chunk in _scan_chunks(content))
+
+
+# Function to list every basketball keyword and recommendation cue found in the text
+def scan_basketball_content(content):
+    keywords = set()
+    cues = set()
+    for chunk in _scan_chunks(content):
+        keywords |= chunk.keywords()
+        cues |= chunk.cues()
+    return BasketballScan(keywords, cues)
+
+
+# Function to filter recommendations to ensure they're basketball-related
+def filter_basketball_recommendations(response):
+    is_recommendation = False
+    for chunk in _scan_chunks(response):
+        # Any basketball keyword means the response stands, recommendation or not
+        if chunk.keywords(first_only=True):
+            return response
+        if not is_recommendation and chunk.cues(first_only=True):
+            is_recommendation = True
+
+    if is_recommendation:
+        # Replace with basketball-specific recommendation or redirect
+        return REDIRECT_MESSAGE
+
+    return response
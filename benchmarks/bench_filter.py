@@ -0,0 +1,89 @@
+"""Micro-benchmark: basketball keyword matcher vs. the original per-keyword substring loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_filter.py
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from basketball_filter import (BASKETBALL_KEYWORDS, REDIRECT_MESSAGE, filter_basketball_recommendations,
+                               is_basketball_related)
+
+# The implementation this module replaced, kept here as the baseline
+LEGACY_RECOMMENDATION_PATTERNS = [
+    r'recommend(?:ed|ation|ations)?',
+    r'suggest(?:ed|ion|ions)?',
+    r'advice',
+    r'you (?:could|should|might) try',
+    r'consider'
+]
+
+
+def legacy_is_basketball_related(content):
+    content = content.lower()
+    for keyword in BASKETBALL_KEYWORDS:
+        if keyword.lower() in content:
+            return True
+    return False
+
+
+def legacy_filter_basketball_recommendations(response):
+    is_recommendation = False
+    for pattern in LEGACY_RECOMMENDATION_PATTERNS:
+        if re.search(pattern, response.lower()):
+            is_recommendation = True
+            break
+    if is_recommendation and not legacy_is_basketball_related(response):
+        return REDIRECT_MESSAGE
+    return response
+
+
+# Off-topic vocabulary avoids every keyword, even as a substring, so both matchers scan the whole text
+OFF_TOPIC_WORDS = ("the quick brown fox jumps over lazy dog while cooking dinner and reading about "
+                   "gardening weather travel music history recipes").split()
+ON_TOPIC_WORDS = ("the coach wants the team to attack the paint and rotate on defense after each "
+                  "rebound while the point guard reads the pick and roll").split()
+
+
+def make_response(words, length, seed=0):
+    rng = random.Random(seed)
+    text = []
+    size = 0
+    while size < length:
+        word = rng.choice(words)
+        text.append(word)
+        size += len(word) + 1
+    # A recommendation cue at the very end forces a full scan for cues too
+    return " ".join(text) + ". You should try this."
+
+
+def best_of(fn, text, number, repeat=5):
+    return min(timeit.repeat(lambda: fn(text), number=number, repeat=repeat)) / number
+
+
+def main():
+    cases = [
+        ("is_basketball_related", legacy_is_basketball_related, is_basketball_related),
+        ("filter_basketball_recommendations", legacy_filter_basketball_recommendations, filter_basketball_recommendations),
+    ]
+    print(f"{'function':<36}{'corpus':<10}{'chars':>9}{'legacy us':>12}{'new us':>10}{'speedup':>9}")
+    for length in (2_000, 20_000, 200_000):
+        number = max(1, 200_000 // length)
+        for corpus, words in (("off-topic", OFF_TOPIC_WORDS), ("on-topic", ON_TOPIC_WORDS)):
+            text = make_response(words, length)
+            for name, legacy_fn, new_fn in cases:
+                assert legacy_fn(text) == new_fn(text)
+                legacy_time = best_of(legacy_fn, text, number)
+                new_time = best_of(new_fn, text, number)
+                print(f"{name:<36}{corpus:<10}{len(text):>9}{legacy_time * 1e6:>12.1f}{new_time * 1e6:>10.1f}"
+                      f"{legacy_time / new_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
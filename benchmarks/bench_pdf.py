@@ -0,0 +1,83 @@
+"""Benchmark: chunked chat PDF export vs. building every Paragraph up front into a BytesIO.
+
+Run from the repository root:
+
+    python benchmarks/bench_pdf.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate
+
+from chat_export import add_page_number, iter_chat_flowables, write_chat_pdf
+
+SENTENCES = [
+    "Track defensive rating alongside opponent effective field goal percentage to judge rim protection.",
+    "Pace-adjusted numbers make comparisons between fast and slow teams fair.",
+    "A high usage rate with a falling true shooting percentage usually means the player is being overextended.",
+    "Pick and roll coverage should change with the ball handler's pull-up three-point accuracy.",
+    "Rest days before back-to-backs tend to lift fourth-quarter efficiency.",
+]
+
+
+def make_transcript(messages, seed=0):
+    rng = random.Random(seed)
+    history = []
+    for i in range(messages):
+        if i % 2 == 0:
+            history.append({"role": "user", "content": rng.choice(SENTENCES)})
+        else:
+            # Assistant answers are long, like real model output
+            history.append({"role": "assistant", "content": " ".join(rng.choice(SENTENCES) for _ in range(12))})
+    return history
+
+
+def build_all_at_once(history):
+    # The previous approach: every flowable created first, whole document held in memory
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    doc.build(list(iter_chat_flowables(history)), onFirstPage=add_page_number, onLaterPages=add_page_number)
+    return len(buffer.getvalue())
+
+
+def build_chunked_to_file(history):
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_chat_pdf(history, f)
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def measure(fn, history):
+    # Timed and memory-traced separately; tracemalloc slows reportlab's pure-Python layout several-fold
+    start = time.perf_counter()
+    size = fn(history)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(history)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    print(f"{'messages':>9}{'approach':>16}{'seconds':>10}{'peak MB':>10}{'PDF KB':>10}")
+    for messages in (10, 100, 1000):
+        history = make_transcript(messages)
+        for name, fn in (("all-at-once", build_all_at_once), ("chunked", build_chunked_to_file)):
+            elapsed, peak, size = measure(fn, history)
+            print(f"{messages:>9}{name:>16}{elapsed:>10.2f}{peak / 2**20:>10.1f}{size / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
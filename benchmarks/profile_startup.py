@@ -0,0 +1,102 @@
+"""Profile: app cold start, per-rerun cost, and which heavy libraries the first run loads.
+
+Every measurement runs in a fresh interpreter so import costs are really cold. Run from the repository root:
+
+    python benchmarks/profile_startup.py
+
+To compare against an older revision, profile a checkout of it:
+
+    git worktree add /tmp/buzzer-before <rev>
+    python benchmarks/profile_startup.py --app-dir /tmp/buzzer-before
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that should only load when the feature needing them is first used
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib.figure", "reportlab.platypus", "google.generativeai", "pyarrow.parquet"]
+
+# Runs inside the child interpreter: first run of the app, then reruns, through Streamlit's headless test runner
+APP_RUN_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import = time.perf_counter() - start
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+start = time.perf_counter()
+at.run()
+first_run = time.perf_counter() - start
+reruns = []
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({
+    "streamlit_import_seconds": streamlit_import,
+    "first_run_seconds": first_run,
+    "rerun_seconds": sorted(reruns)[len(reruns) // 2] if reruns else None,
+    "exceptions": [str(e.value) for e in at.exception],
+    "loaded": [name for name in json.loads(sys.argv[3]) if name in sys.modules],
+}))
+"""
+
+# Cold import cost of one library on top of streamlit (which every run pays anyway)
+IMPORT_SNIPPET = """
+import time, streamlit
+start = time.perf_counter()
+__import__({module!r})
+print(time.perf_counter() - start)
+"""
+
+
+def run_child(args, cwd, env):
+    result = subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def profile_app(app_dir, reruns):
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, BUZZER_ROSTER_DB=os.path.join(scratch, "roster.db"), PYTHONPATH=app_dir)
+        output = run_child(["-c", APP_RUN_SNIPPET, os.path.join(app_dir, "streamlit_app.py"), str(reruns),
+                            json.dumps(HEAVY_MODULES)], app_dir, env)
+    return json.loads(output)
+
+
+def profile_imports(app_dir):
+    return {module: float(run_child(["-c", IMPORT_SNIPPET.format(module=module)], app_dir, os.environ))
+            for module in HEAVY_MODULES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app-dir", default=REPO_ROOT, help="directory containing streamlit_app.py")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    app = profile_app(os.path.abspath(args.app_dir), args.reruns)
+    imports = profile_imports(os.path.abspath(args.app_dir))
+    deferred = sum(seconds for module, seconds in imports.items() if module not in app["loaded"])
+
+    print(f"app: {args.app_dir}")
+    print(f"  streamlit import      {app['streamlit_import_seconds']:8.3f} s")
+    print(f"  first run (cold)      {app['first_run_seconds']:8.3f} s")
+    print(f"  rerun (median of {args.reruns})   {app['rerun_seconds']:8.3f} s")
+    print(f"  exceptions            {len(app['exceptions'])}")
+    print(f"{'library':>22}{'cold import s':>15}  loaded by first run")
+    for module, seconds in imports.items():
+        print(f"{module:>22}{seconds:>15.3f}  {'yes' if module in app['loaded'] else 'no (deferred)'}")
+    print(f"  import time deferred  {deferred:8.3f} s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"app_dir": args.app_dir, **app, "import_seconds": imports, "deferred_seconds": deferred}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
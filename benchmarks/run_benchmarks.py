@@ -0,0 +1,352 @@
+"""Headless benchmark suite for BUZZER AI's compute and I/O paths, with machine-readable output.
+
+No browser or network is needed: the Gemini suite drives the real chat flow through Streamlit's test
+runner against FakeGeminiModel. Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --quick --suite metrics --suite filter
+    python benchmarks/run_benchmarks.py --output new.json --compare baseline.json --threshold 1.25
+
+With --compare the exit status is 1 when any case is slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from bench_filter import OFF_TOPIC_WORDS, ON_TOPIC_WORDS, make_response
+from bench_pdf import make_transcript
+
+SUITES = ["filter", "pdf", "charts", "metrics", "shots", "game_logs", "gemini"]
+
+ROSTER_SIZES = [10, 100, 1_000, 10_000, 100_000]
+QUICK_ROSTER_SIZES = [10, 100, 1_000, 10_000]
+
+SHOT_LOG_SIZES = [100_000, 1_000_000, 5_000_000]
+QUICK_SHOT_LOG_SIZES = [100_000, 1_000_000]
+
+# Players in the game log store, each with three 82-game seasons
+GAME_LOG_PLAYERS = [1_000, 10_000, 50_000]
+QUICK_GAME_LOG_PLAYERS = [1_000, 10_000]
+SEASON_GAMES = 82
+
+POSITIONS = ["Guard", "Forward", "Center"]
+
+
+# Function to time a callable: median and best of `repeat` runs, each averaging `number` calls
+def measure(fn, number=1, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {"seconds": statistics.median(timings), "best_seconds": min(timings), "runs": repeat, "calls_per_run": number}
+
+
+# Function to make a synthetic {name: player dict} roster
+def make_roster(size, games=10, seed=0):
+    rng = random.Random(seed)
+    return {
+        f"Player {index}": {
+            "PPG": round(rng.uniform(2, 35), 1), "RPG": round(rng.uniform(0.5, 14), 1), "APG": round(rng.uniform(0.5, 11), 1),
+            "FG%": round(rng.uniform(38, 62), 1), "3P%": round(rng.uniform(20, 45), 1), "FT%": round(rng.uniform(55, 95), 1),
+            "games": [rng.randint(0, 50) for _ in range(games)], "position": rng.choice(POSITIONS),
+        }
+        for index in range(size)
+    }
+
+
+# Function to make a synthetic shot log: shots spread around the basket, makes less likely with distance
+def make_shot_log(players, shots, seed=0):
+    import numpy as np
+    from shot_chart import ShotLog
+
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, np.pi, shots)
+    distance = np.abs(rng.normal(12, 9, shots))
+    names = np.array([f"Player {index}" for index in range(players)], dtype=object)[rng.integers(0, players, shots)]
+    return ShotLog.from_columns(names, distance * np.cos(angle), distance * np.sin(angle) - 1,
+                                rng.random(shots) < 0.6 - 0.01 * distance, rng.integers(1, 83, shots))
+
+
+def bench_filter(quick):
+    from basketball_filter import filter_basketball_recommendations, is_basketball_related
+
+    results = []
+    for length in (2_000, 20_000) if quick else (2_000, 20_000, 200_000):
+        number = max(1, 200_000 // length)
+        for corpus, words in (("off-topic", OFF_TOPIC_WORDS), ("on-topic", ON_TOPIC_WORDS)):
+            # A corpus of distinct responses, cycled through so no call sees the same string twice in a row
+            texts = [make_response(words, length, seed) for seed in range(8)]
+            for name, fn in (("is_basketball_related", is_basketball_related),
+                             ("filter_basketball_recommendations", filter_basketball_recommendations)):
+                cycle = iter(texts * (number * 5 // len(texts) + 1))
+                results.append({"case": f"{name}/{corpus}/{length}", "params": {"chars": length, "corpus": corpus},
+                                **measure(lambda: fn(next(cycle)), number=number)})
+    return results
+
+
+def bench_pdf(quick):
+    from chat_export import create_chat_pdf
+
+    results = []
+    for messages in (10, 100) if quick else (10, 100, 1000):
+        history = make_transcript(messages)
+        size = len(create_chat_pdf(history).getvalue())
+        results.append({"case": f"create_chat_pdf/{messages}", "params": {"messages": messages, "pdf_bytes": size},
+                        **measure(lambda: create_chat_pdf(history), repeat=3)})
+    return results
+
+
+def bench_charts(quick):
+    from player_charts import ChartCache, player_chart_key, render_player_stats_png, render_shot_chart_png
+    from shot_chart import HexGrid
+
+    player_name, player = next(iter(make_roster(1).items()))
+    render_player_stats_png(player_name, player)  # first render pays for importing matplotlib
+    cache = ChartCache()
+    key = player_chart_key("player_stats", player_name, player)
+    cache.get_or_render(key, lambda: render_player_stats_png(player_name, player))
+    shot_log = make_shot_log(1, 2_000)
+    hex_bins = shot_log.hex_bins("Player 0", HexGrid())
+    return [
+        {"case": "render_player_stats_png", "params": {}, **measure(lambda: render_player_stats_png(player_name, player), repeat=3 if quick else 5)},
+        {"case": "render_shot_chart_png", "params": {"bins": len(hex_bins.x)}, **measure(lambda: render_shot_chart_png(player_name, hex_bins), repeat=3 if quick else 5)},
+        # What generate_player_stats costs once the chart is cached
+        {"case": "player_stats_cache_hit", "params": {},
+         **measure(lambda: cache.get_or_render(player_chart_key("player_stats", player_name, player), lambda: b""), number=1000)},
+    ]
+
+
+def bench_metrics(quick):
+    from leaderboard import Leaderboard
+    from player_record import Roster
+    from player_metrics import RosterMetrics, build_roster_table, compare_players, compute_player_metrics
+    from player_similarity import SimilarityIndex
+
+    results = []
+    for size in QUICK_ROSTER_SIZES if quick else ROSTER_SIZES:
+        roster = make_roster(size)
+        repeat = 3 if size >= 10_000 else 5
+        params = {"players": size}
+        table = build_roster_table(roster)
+        metrics = compute_player_metrics(table)
+        results.append({"case": f"build_roster_table/{size}", "params": params, **measure(lambda: build_roster_table(roster), repeat=repeat)})
+        # The same roster as the store serves it: shared PlayerRecords with packed game logs
+        records = Roster(roster)
+        results.append({"case": f"build_roster_table_records/{size}", "params": params, **measure(lambda: build_roster_table(records), repeat=repeat)})
+        results.append({"case": f"compute_player_metrics/{size}", "params": params, **measure(lambda: compute_player_metrics(table), repeat=repeat)})
+
+        def full_rating():
+            Leaderboard().sync(0, roster)
+
+        # One leaderboard flipping between the roster and the roster plus one player: each sync is a single add or remove
+        grown = dict(roster, **{"New Player": make_roster(1, seed=size)["Player 0"]})
+        leaderboard = Leaderboard()
+        leaderboard.sync(0, roster)
+        versions = iter(range(1, 10**9))
+
+        def incremental_rating():
+            version = next(versions)
+            leaderboard.sync(version, grown if version % 2 else roster)
+
+        results.append({"case": f"leaderboard_full_rating/{size}", "params": params, **measure(full_rating, repeat=repeat)})
+        results.append({"case": f"leaderboard_add_or_remove_one/{size}", "params": params, **measure(incremental_rating, repeat=repeat)})
+
+        # The shared metrics table across the same flips: only the added player's row is computed
+        roster_metrics = RosterMetrics()
+        roster_metrics.sync(0, roster)
+
+        def incremental_metrics():
+            version = next(versions)
+            roster_metrics.sync(version, grown if version % 2 else roster)
+
+        results.append({"case": f"roster_metrics_add_or_remove_one/{size}", "params": params, **measure(incremental_metrics, repeat=repeat)})
+
+        group = list(roster)[:20]
+        results.append({"case": f"compare_players_20/{size}", "params": params, **measure(lambda: compare_players(metrics, group), number=20, repeat=repeat)})
+
+        index = SimilarityIndex.from_metrics(roster, metrics)
+        results.append({"case": f"similarity_build/{size}", "params": {**params, "approximate": index.approximate},
+                        **measure(lambda: SimilarityIndex.from_metrics(roster, metrics), repeat=repeat)})
+        results.append({"case": f"similarity_query_k10/{size}", "params": {**params, "approximate": index.approximate},
+                        **measure(lambda: index.neighbours(group[:1], 10), number=20, repeat=repeat)})
+    return results
+
+
+def bench_shots(quick):
+    import numpy as np
+    import pandas as pd
+    from shot_chart import HexGrid, ShotChartStore, ShotLog
+
+    grid = HexGrid()
+    results = []
+    for shots in QUICK_SHOT_LOG_SIZES if quick else SHOT_LOG_SIZES:
+        players = max(10, shots // 1000)
+        log = make_shot_log(players, shots)
+        params = {"shots": shots, "players": players}
+        columns = (np.repeat(np.array(log.names, dtype=object), np.diff(log.offsets)), log.x, log.y, log.made, log.game)
+        results.append({"case": f"shot_log_build/{shots}", "params": params, **measure(lambda: ShotLog.from_columns(*columns), repeat=3)})
+        results.append({"case": f"zone_summary/{shots}", "params": params, **measure(lambda: log.zone_summary("Player 1"), number=1000)})
+        results.append({"case": f"hex_bins/{shots}", "params": params, **measure(lambda: log.hex_bins("Player 1", grid), number=100)})
+
+    # Import throughput, CSV parsing included
+    with tempfile.TemporaryDirectory() as scratch:
+        shots = 200_000 if quick else 1_000_000
+        log = make_shot_log(shots // 1000, shots)
+        path = os.path.join(scratch, "shots.csv")
+        pd.DataFrame({"name": np.repeat(np.array(log.names, dtype=object), np.diff(log.offsets)), "x": log.x, "y": log.y,
+                      "made": log.made.astype(int), "game": log.game}).to_csv(path, index=False)
+        report = ShotChartStore().import_shot_log(path)
+        results.append({"case": f"import_shot_log_csv/{shots}", "params": {"shots": shots, "rows_per_second": report.rows_per_second},
+                        **measure(lambda: ShotChartStore().import_shot_log(path), repeat=3)})
+    return results
+
+
+def bench_game_logs(quick):
+    import numpy as np
+    from game_log_store import GameLogStore
+
+    rng = np.random.default_rng(0)
+    results = []
+    for players in QUICK_GAME_LOG_PLAYERS if quick else GAME_LOG_PLAYERS:
+        names = [f"Player {index}" for index in range(players)]
+        seasons = rng.integers(0, 50, (players, 3 * SEASON_GAMES)).astype(np.float32)
+        params = {"players": players, "games": 3 * SEASON_GAMES}
+        with tempfile.TemporaryDirectory() as scratch:
+            store = GameLogStore(scratch)
+
+            def load_all():
+                with store.batch():
+                    for name, games in zip(names, seasons):
+                        store.replace(name, games)
+
+            results.append({"case": f"game_log_load/{players}", "params": params, **measure(load_all, repeat=1)})
+            # One new game at a time, the way the Performance Tracker logs them
+            players_cycle = iter(names * 1000)
+            results.append({"case": f"game_log_append_one/{players}", "params": params,
+                            **measure(lambda: store.append(next(players_cycle), [30.0]), number=100, repeat=3)})
+            results.append({"case": f"game_log_slice/{players}", "params": params,
+                            **measure(lambda: store.games(names[players // 2]).mean(), number=1000)})
+            results.append({"case": f"game_log_games_for_all/{players}", "params": params,
+                            **measure(lambda: store.games_for(names), repeat=3)})
+            store.close()
+    return results
+
+
+def bench_gemini(quick, latency, questions):
+    import gemini_client
+    from perf_metrics import registry
+    from streamlit.testing.v1 import AppTest
+
+    # Every pooled model is the local fake; the dispatcher, context builder, filter and cache all run for real
+    gemini_client.create_gemini_model = lambda api_key, model_name=None, temperature=0.7: gemini_client.FakeGeminiModel(
+        latency=latency, chunk_delay=latency / 20)
+    questions = questions if not quick else min(questions, 5)
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["BUZZER_ROSTER_DB"] = os.path.join(scratch, "roster.db")
+        os.environ.pop("BUZZER_RESPONSE_CACHE_FILE", None)
+        for mode, stream in (("streaming", True), ("blocking", False)):
+            at = AppTest.from_file(os.path.join(REPO_ROOT, "streamlit_app.py"), default_timeout=300).run()
+            at.session_state["stream_responses"] = stream
+            registry.reset()
+            asked = [f"How should a team defend the pick and roll in situation {mode} {number}?" for number in range(questions)]
+            for question in asked + asked[:1]:  # the repeat is served from the response cache
+                next(area for area in at.text_area if area.label.startswith("💬")).input(question)
+                next(button for button in at.button if button.label == "Send Message").click().run()
+            if at.exception:
+                raise RuntimeError(f"app raised: {[str(e.value) for e in at.exception]}")
+            response = registry.snapshot()["gemini.response"]
+            request = registry.snapshot()["gemini.request"]
+            results.append({"case": f"get_gemini_response/{mode}", "params": {"fake_latency": latency, "questions": questions + 1},
+                            "seconds": response["mean_ms"] / 1000, "p95_seconds": response["p95_ms"] / 1000,
+                            "request_seconds": request["mean_ms"] / 1000, "runs": response["count"], "calls_per_run": 1})
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Function to list cases that got slower than the baseline by more than `threshold` times
+def find_regressions(results, baseline, threshold):
+    previous = {(result["suite"], result["case"]): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["suite"], result["case"]))
+        if before and result["seconds"] > before * threshold:
+            regressions.append({"suite": result["suite"], "case": result["case"], "baseline_seconds": before,
+                                "seconds": result["seconds"], "ratio": result["seconds"] / before})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=SUITES, help="run only these suites (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, for a fast smoke run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--fake-latency", type=float, default=0.05, help="seconds per fake Gemini call")
+    parser.add_argument("--questions", type=int, default=20, help="chat messages sent per Gemini mode")
+    parser.add_argument("--compare", help="baseline results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    runners = {
+        "filter": lambda: bench_filter(args.quick),
+        "pdf": lambda: bench_pdf(args.quick),
+        "charts": lambda: bench_charts(args.quick),
+        "metrics": lambda: bench_metrics(args.quick),
+        "shots": lambda: bench_shots(args.quick),
+        "game_logs": lambda: bench_game_logs(args.quick),
+        "gemini": lambda: bench_gemini(args.quick, args.fake_latency, args.questions),
+    }
+    results = []
+    for suite in args.suite or SUITES:
+        start = time.perf_counter()
+        suite_results = runners[suite]()
+        results.extend({"suite": suite, **result} for result in suite_results)
+        print(f"{suite}: {len(suite_results)} cases in {time.perf_counter() - start:.1f}s")
+        for result in suite_results:
+            print(f"  {result['case']:<48}{result['seconds'] * 1000:>12.3f} ms")
+
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["regressions"] = find_regressions(results, json.load(f), args.threshold)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['suite']}/{regression['case']}: {regression['baseline_seconds'] * 1000:.3f} ms -> "
+              f"{regression['seconds'] * 1000:.3f} ms ({regression['ratio']:.2f}x)")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
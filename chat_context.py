@@ -0,0 +1,97 @@
+from collections import deque
+
+# Rough characters-per-token ratio used to report prompt size in tokens
+CHARS_PER_TOKEN = 4
+
+# How much of an evicted message is kept in the rolling summary
+SUMMARY_SNIPPET_CHARS = 160
+
+
+class ConversationContextBuilder:
+    """Incrementally renders chat history into a prompt that stays within a character budget."""
+
+    def __init__(self, char_budget=12000, summary_budget=2000):
+        self.char_budget = char_budget
+        self.summary_budget = summary_budget
+        self.last_prompt_chars = 0
+        self.reset()
+
+    def reset(self):
+        # Rendered "User: ..." / "Assistant: ..." lines inside the sliding window
+        self._window = deque()
+        self._window_chars = 0
+        # One short line per message that slid out of the window
+        self._summary = deque()
+        self._summary_chars = 0
+        # Cached join of the summary and window, rebuilt only when they change
+        self._prefix = ""
+        self._prefix_dirty = False
+        # Number of history entries already rendered and the last one seen
+        self._consumed = 0
+        self._last_entry = None
+
+    @property
+    def last_prompt_tokens(self):
+        return self.last_prompt_chars // CHARS_PER_TOKEN
+
+    def set_budget(self, char_budget):
+        # A larger budget may need messages that were already evicted, so start over
+        if char_budget != self.char_budget:
+            self.char_budget = char_budget
+            self.reset()
+
+    def build(self, system_prompt, history, user_input, note=""):
+        self._sync(history)
+        if self._prefix_dirty:
+            self._prefix = self._render_summary() + "".join(self._window)
+            self._prefix_dirty = False
+
+        prompt = f"{system_prompt}\n\n{self._prefix}{note}User: {user_input}\nAssistant: "
+        self.last_prompt_chars = len(prompt)
+        return prompt
+
+    def _sync(self, history):
+        # History was cleared or replaced since the last turn
+        if self._consumed > len(history) or (self._consumed and history[self._consumed - 1] != self._last_entry):
+            self.reset()
+
+        for entry in history[self._consumed:]:
+            self._append(entry)
+        self._consumed = len(history)
+        if history:
+            self._last_entry = history[-1]
+
+    def _append(self, entry):
+        speaker = "User" if entry["role"] == "user" else "Assistant"
+        line = f"{speaker}: {entry['content']}\n"
+        self._window.append(line)
+        self._window_chars += len(line)
+
+        if not self._prefix_dirty:
+            # Common case: the new line goes on the end of the cached prefix
+            self._prefix += line
+
+        # Slide the window, keeping at least the most recent message verbatim
+        while self._window_chars > self.char_budget and len(self._window) > 1:
+            evicted = self._window.popleft()
+            self._window_chars -= len(evicted)
+            self._summarize(evicted)
+            self._prefix_dirty = True
+
+    def _summarize(self, line):
+        speaker, _, content = line.partition(": ")
+        content = " ".join(content.split())
+        if len(content) > SUMMARY_SNIPPET_CHARS:
+            content = content[:SUMMARY_SNIPPET_CHARS].rsplit(" ", 1)[0] + "..."
+        summary_line = f"- {speaker}: {content}\n"
+        self._summary.append(summary_line)
+        self._summary_chars += len(summary_line)
+
+        # Rolling summary: the oldest points fall off once the summary is full
+        while self._summary_chars > self.summary_budget and len(self._summary) > 1:
+            self._summary_chars -= len(self._summary.popleft())
+
+    def _render_summary(self):
+        if not self._summary:
+            return ""
+        return "Summary of earlier conversation:\n" + "".join(self._summary) + "\nRecent conversation:\n"
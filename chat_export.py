@@ -0,0 +1,220 @@
+import functools
+import itertools
+import os
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime
+from io import BytesIO
+
+from perf_metrics import timer
+
+# Messages turned into Paragraphs at a time; only this many are alive while the PDF is laid out
+EXPORT_CHUNK_MESSAGES = 50
+
+# Where finished exports are kept, one file per distinct chat history
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "buzzer_ai_exports")
+
+# An export is reused for this long after it was built, so its "Generated on" time stays close to the download
+EXPORT_MAX_AGE_SECONDS = 10 * 60
+
+# Most exports kept in EXPORT_DIR; the oldest are deleted first
+EXPORT_MAX_FILES = 32
+
+ChatStyles = namedtuple("ChatStyles", ["normal", "title", "meta", "user", "assistant"])
+
+
+# Function to build the PDF styles once per process; reportlab is only imported when the first export runs
+@functools.lru_cache(maxsize=None)
+def get_chat_styles():
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    styles = getSampleStyleSheet()
+
+    # Enhanced custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor('#FF4B4B'),
+        alignment=1  # Center alignment
+    )
+
+    # Style for date and metadata
+    meta_style = ParagraphStyle(
+        'MetaStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.grey,
+        spaceAfter=20,
+        alignment=1  # Center alignment
+    )
+
+    # Custom style for user messages
+    user_style = ParagraphStyle(
+        'UserStyle',
+        parent=styles['Normal'],
+        fontSize=12,
+        leading=16,
+        backColor=colors.HexColor('#e6f7ff'),
+        borderPadding=10,
+        borderWidth=1,
+        borderColor=colors.HexColor('#1890ff'),
+        borderRadius=8,
+        spaceAfter=15,
+        spaceBefore=15,
+        alignment=0  # Left alignment
+    )
+
+    # Custom style for assistant messages
+    assistant_style = ParagraphStyle(
+        'AssistantStyle',
+        parent=styles['Normal'],
+        fontSize=12,
+        leading=16,
+        backColor=colors.HexColor('#f8f9fa'),
+        borderPadding=10,
+        borderWidth=1,
+        borderColor=colors.HexColor('#FF4B4B'),
+        borderRadius=8,
+        spaceAfter=15,
+        spaceBefore=15,
+        alignment=0  # Left alignment
+    )
+
+    return ChatStyles(styles["Normal"], title_style, meta_style, user_style, assistant_style)
+
+
+class _FlowableStream(list):
+    # The reportlab build loop consumes flowables from the front of its list. This list tops itself
+    # up one chunk at a time from a generator, so a long transcript never exists as Paragraphs all at once.
+
+    def __init__(self, source, chunk_size):
+        super().__init__()
+        self._source = iter(source)
+        self._chunk_size = chunk_size
+        self._exhausted = False
+
+    def _refill(self):
+        # Keep a couple of flowables buffered so keep-with-next lookahead still works
+        if not self._exhausted and list.__len__(self) < 2:
+            chunk = list(itertools.islice(self._source, self._chunk_size))
+            if chunk:
+                self.extend(chunk)
+            else:
+                self._exhausted = True
+
+    def __len__(self):
+        self._refill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._refill()
+        return list.__getitem__(self, index)
+
+
+# Function to lazily turn the chat history into PDF flowables
+def iter_chat_flowables(chat_history):
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = get_chat_styles()
+
+    # Add logo and title
+    yield Paragraph("🏀 BUZZER AI Chat History", styles.title)
+
+    # Add date and metadata
+    current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    yield Paragraph(f"📅 Generated on: {current_date}", styles.meta)
+    yield Spacer(1, 20)
+
+    # Add chat history with message numbers
+    if not chat_history:
+        yield Paragraph("No chat history available.", styles.normal)
+    else:
+        for message_count, message in enumerate(chat_history, start=1):
+            content = message['content'].replace('*', '')  # Remove asterisks
+            if message["role"] == "user":
+                yield Paragraph(f"{message_count}. 👤 <b>You:</b><br/>{content}", styles.user)
+            else:
+                yield Paragraph(f"{message_count}. 🤖 <b>BUZZER AI:</b><br/>{content}", styles.assistant)
+
+    # Add footer
+    yield Spacer(1, 30)
+    yield Paragraph("🏀 Generated by BUZZER AI - Your AI Basketball Analytics Assistant", styles.meta)
+
+
+# Add footer with page numbers
+def add_page_number(canvas, doc):
+    from reportlab.lib.pagesizes import letter
+
+    page_num = canvas.getPageNumber()
+    text = f"Page {page_num}"
+    canvas.saveState()
+    canvas.setFont('Helvetica', 9)
+    canvas.drawCentredString(letter[0]/2, 30, text)
+    canvas.restoreState()
+
+
+# Function to render the chat history as a PDF into a file path or a writable binary stream
+@timer("chat_pdf.write")
+def write_chat_pdf(chat_history, output, chunk_size=EXPORT_CHUNK_MESSAGES):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(output, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72,
+                            pageCompression=1)
+    doc.build(_FlowableStream(iter_chat_flowables(chat_history), chunk_size),
+              onFirstPage=add_page_number, onLaterPages=add_page_number)
+
+
+# Function to create PDF from chat history in memory
+def create_chat_pdf(chat_history):
+    buffer = BytesIO()
+    write_chat_pdf(chat_history, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+# Function to delete exports older than `max_age` seconds, then the oldest beyond `max_files`
+def prune_exports(export_dir=EXPORT_DIR, max_age=EXPORT_MAX_AGE_SECONDS, max_files=EXPORT_MAX_FILES):
+    now = time.time()
+    exports = []
+    for entry in os.scandir(export_dir):
+        try:
+            exports.append((entry.stat().st_mtime, entry.path))
+        except FileNotFoundError:
+            continue
+    exports.sort(reverse=True)
+    removed = 0
+    for index, (modified, path) in enumerate(exports):
+        if now - modified > max_age or index >= max_files:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+# Function to export the chat history to a PDF file on disk, reusing a recent export of the same history
+def export_chat_pdf_file(chat_history, history_digest):
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{history_digest}.pdf")
+    try:
+        fresh = time.time() - os.path.getmtime(path) <= EXPORT_MAX_AGE_SECONDS
+    except FileNotFoundError:
+        fresh = False
+    if not fresh:
+        # Write under a temporary name so a half-built file is never served
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=EXPORT_DIR)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_chat_pdf(chat_history, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        prune_exports()
+    return path
@@ -0,0 +1,301 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# Stat columns kept per game, one file each; box-score columns can be added by passing `columns`
+GAME_LOG_COLUMNS = ("points",)
+
+# Game values are stored as float32, the same as PlayerRecord game logs
+GAME_DTYPE = np.dtype(np.float32)
+
+# Smallest extent given to a player; extents double when they fill up
+MIN_EXTENT_GAMES = 16
+
+# Files are compacted once this share of their rows is no longer part of any player's extent
+COMPACT_DEAD_FRACTION = 0.5
+
+# ... and only once they hold at least this many rows
+COMPACT_MIN_ROWS = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extents (
+    name TEXT PRIMARY KEY,
+    start INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    capacity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _extent_capacity(games):
+    # Next power of two, so a player appending game by game is relocated O(log n) times
+    capacity = MIN_EXTENT_GAMES
+    while capacity < games:
+        capacity *= 2
+    return capacity
+
+
+class GameLogStore:
+    """Season-long game logs on disk: one memory-mapped float32 file per stat column plus an offset index.
+
+    Each player's games sit in one contiguous extent of the files, so `games(name)` is a read-only slice of
+    the memory map (no copy, no read until the values are used). Extents have spare capacity: appending
+    writes only the new games, and a full extent is moved to the end of the files with double the room,
+    copying that player's games but never rewriting the rest. The index lives in SQLite next to the files.
+
+    Moved and replaced logs leave dead rows behind. Once they pass COMPACT_DEAD_FRACTION of the files, the live
+    extents are packed into a new generation of files and the old ones are deleted, so views handed out
+    earlier keep reading the files they were made from.
+    """
+
+    def __init__(self, directory, columns=GAME_LOG_COLUMNS):
+        self.directory = directory
+        self.columns = tuple(columns)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._writes = 0
+        self._in_batch = False
+        self._index_version = None
+        self._extents = {}
+        self._live_rows = 0
+        self._allocated = 0
+        self._generation = 0
+        self._maps = {}
+        self._mapped_rows = 0
+        self._refresh()
+        self._remove_old_generations()
+
+    def _path(self, column, generation=None):
+        generation = self._generation if generation is None else generation
+        return os.path.join(self.directory, f"{column}.bin" if generation == 0 else f"{column}.{generation}.bin")
+
+    @property
+    def version(self):
+        # Changes whenever this process writes or another connection commits to the index
+        with self._lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            return f"{data_version}.{self._writes}"
+
+    def __contains__(self, name):
+        self._refresh()
+        return name in self._extents
+
+    def __len__(self):
+        self._refresh()
+        return len(self._extents)
+
+    def names(self):
+        self._refresh()
+        return list(self._extents)
+
+    def extent(self, name):
+        # (start, length) of a player's games, or None; changes whenever the player's log does
+        self._refresh()
+        extent = self._extents.get(name)
+        return extent[:2] if extent else None
+
+    def extents(self):
+        # {name: (start, length)} for every player
+        self._refresh()
+        return {name: extent[:2] for name, extent in self._extents.items()}
+
+    def game_count(self, name):
+        self._refresh()
+        extent = self._extents.get(name)
+        return extent[1] if extent else 0
+
+    def games(self, name, column="points"):
+        # Zero-copy, read-only view of one player's games for one stat column
+        with self._lock:
+            self._refresh()
+            extent = self._extents.get(name)
+            if extent is None or not extent[1]:
+                return np.empty(0, dtype=GAME_DTYPE)
+            start, length, _ = extent
+            return self._map(column, start + length)[start:start + length]
+
+    def games_for(self, names, column="points"):
+        # {name: view} for many players with one index check, e.g. when a whole roster is loaded
+        with self._lock:
+            self._refresh()
+            extents = [(name, self._extents.get(name)) for name in names]
+            end = max((extent[0] + extent[1] for _, extent in extents if extent), default=0)
+            mapped = self._map(column, end) if end else None
+            return {name: mapped[extent[0]:extent[0] + extent[1]] if extent and extent[1] else np.empty(0, dtype=GAME_DTYPE)
+                    for name, extent in extents}
+
+    @contextmanager
+    def batch(self):
+        # Group several writes into one index transaction
+        with self._lock:
+            if self._in_batch:
+                yield self
+                return
+            self._connection.execute("BEGIN IMMEDIATE")
+            # Read the index inside the write lock, so space another process just allocated is seen
+            self._refresh()
+            self._in_batch = True
+            try:
+                yield self
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                self._index_version = None
+                raise
+            finally:
+                self._in_batch = False
+                self._writes += 1
+            # The in-memory index already has this batch's changes
+            self._index_version = self.version
+            if self._allocated >= COMPACT_MIN_ROWS and self._allocated - self._live_rows > COMPACT_DEAD_FRACTION * self._allocated:
+                self.compact()
+
+    def append(self, name, games):
+        # `games` is a sequence of points or a {column: values} mapping; missing columns are stored as NaN
+        values = self._column_values(games)
+        count = len(values[self.columns[0]])
+        if not count:
+            return
+        with self.batch():
+            start, length, capacity = self._extents.get(name, (None, 0, 0))
+            if start is None or length + count > capacity:
+                # Move the player (with room to grow) to the end of the files; only their games are copied
+                moved = {column: np.array(self.games(name, column)) for column in self.columns} if length else None
+                start, capacity = self._allocated, _extent_capacity(length + count)
+                if moved:
+                    self._write(start, moved)
+                self._allocated = start + capacity
+            self._write(start + length, values)
+            self._set_extent(name, start, length + count, capacity)
+
+    def replace(self, name, games):
+        # A replaced log goes to a fresh extent, so views of the old games never change under a reader
+        with self.batch():
+            self._drop_extent(name)
+            self.append(name, games)
+            if name not in self._extents:
+                self._set_extent(name, self._allocated, 0, 0)
+
+    def remove(self, names):
+        with self.batch():
+            for name in names:
+                if self._drop_extent(name):
+                    self._connection.execute("DELETE FROM extents WHERE name = ?", (name,))
+
+    def compact(self):
+        # Pack the live extents (each keeping room to grow) into a new generation of files
+        with self.batch():
+            generation = self._generation + 1
+            layout = {}
+            start = 0
+            for name, (old_start, length, _) in sorted(self._extents.items(), key=lambda item: item[1][0]):
+                capacity = _extent_capacity(length) if length else 0
+                layout[name] = (start, length, capacity, old_start)
+                start += capacity
+            end = max((old_start + length for _, length, _, old_start in layout.values()), default=0)
+            for column in self.columns:
+                source = self._map(column, end) if end else None
+                with open(self._path(column, generation), "wb") as f:
+                    for new_start, length, _, old_start in layout.values():
+                        if length:
+                            f.seek(new_start * GAME_DTYPE.itemsize)
+                            f.write(source[old_start:old_start + length].tobytes())
+            # New extents and the new generation commit together, so the index never points into the wrong files
+            self._connection.execute("DELETE FROM extents")
+            self._connection.executemany("INSERT INTO extents VALUES (?, ?, ?, ?)",
+                                         [(name, new_start, length, capacity) for name, (new_start, length, capacity, _) in layout.items()])
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (generation,))
+            self._extents = {name: extent[:3] for name, extent in layout.items()}
+            self._live_rows = self._allocated = start
+            self._use_generation(generation)
+        self._remove_old_generations()
+
+    def close(self):
+        with self._lock:
+            self._maps.clear()
+            self._connection.close()
+
+    def _column_values(self, games):
+        if not isinstance(games, dict):
+            games = {self.columns[0]: games}
+        count = len(next(iter(games.values()))) if games else 0
+        return {column: np.asarray(games[column], dtype=GAME_DTYPE) if column in games else np.full(count, np.nan, dtype=GAME_DTYPE)
+                for column in self.columns}
+
+    def _write(self, row, values):
+        # Plain file writes at the row offset; the file grows as needed and memory maps see the new data
+        for column in self.columns:
+            mode = "r+b" if os.path.exists(self._path(column)) else "w+b"
+            with open(self._path(column), mode) as f:
+                f.seek(row * GAME_DTYPE.itemsize)
+                f.write(values[column].tobytes())
+
+    def _set_extent(self, name, start, length, capacity):
+        self._drop_extent(name)
+        self._extents[name] = (start, length, capacity)
+        self._live_rows += capacity
+        self._connection.execute("INSERT OR REPLACE INTO extents VALUES (?, ?, ?, ?)", (name, start, length, capacity))
+
+    def _drop_extent(self, name):
+        extent = self._extents.pop(name, None)
+        if extent is None:
+            return False
+        self._live_rows -= extent[2]
+        return True
+
+    def _use_generation(self, generation):
+        # Maps of the previous generation are dropped here; views already handed out keep their own
+        self._generation = generation
+        self._maps = {}
+        self._mapped_rows = 0
+
+    def _remove_old_generations(self):
+        # Only earlier generations: a newer file may belong to a compaction another process hasn't committed yet.
+        # A file still mapped elsewhere may refuse removal (Windows); it is retried on the next open or compaction.
+        for file_name in os.listdir(self.directory):
+            parts = file_name.split(".")
+            if parts[-1] != "bin" or parts[0] not in self.columns:
+                continue
+            generation = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else 0 if len(parts) == 2 else None
+            if generation is not None and generation < self._generation:
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
+
+    def _map(self, column, rows):
+        # Memory maps are reopened only when they don't yet cover the rows asked for
+        if rows > self._mapped_rows:
+            size = min(os.path.getsize(self._path(column)) // GAME_DTYPE.itemsize for column in self.columns)
+            self._maps = {name: np.memmap(self._path(name), dtype=GAME_DTYPE, mode="r", shape=(size,)) for name in self.columns}
+            self._mapped_rows = size
+        return self._maps[column]
+
+    def _refresh(self):
+        version = self.version
+        if version == self._index_version or self._in_batch:
+            return
+        with self._lock:
+            rows = self._connection.execute("SELECT name, start, length, capacity FROM extents").fetchall()
+            generation = self._connection.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            generation = generation[0] if generation else 0
+            if generation != self._generation:
+                self._use_generation(generation)
+            self._extents = {name: (start, length, capacity) for name, start, length, capacity in rows}
+            self._live_rows = sum(capacity for _, _, capacity in self._extents.values())
+            self._allocated = max((start + capacity for start, _, capacity in self._extents.values()), default=0)
+            # Space past the last extent may already be in the files from a removed or moved player
+            for column in self.columns:
+                if os.path.exists(self._path(column)):
+                    self._allocated = max(self._allocated, os.path.getsize(self._path(column)) // GAME_DTYPE.itemsize)
+            self._index_version = version
@@ -0,0 +1,176 @@
+import math
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+# Default rolling windows (in games) kept for every series
+DEFAULT_WINDOWS = (3, 5, 10)
+
+# Span of the exponentially weighted moving average, in games
+EWMA_SPAN = 5
+
+
+class _RollingWindow:
+    # Sum and sum of squares over the last `size` games, updated in O(1) per game
+
+    __slots__ = ("size", "values", "total", "total_sq")
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, points):
+        self.values.append(points)
+        self.total += points
+        self.total_sq += points * points
+        if len(self.values) > self.size:
+            dropped = self.values.popleft()
+            self.total -= dropped
+            self.total_sq -= dropped * dropped
+
+    @property
+    def mean(self):
+        return self.total / len(self.values) if self.values else math.nan
+
+    @property
+    def std(self):
+        if not self.values:
+            return math.nan
+        mean = self.mean
+        # Population std, like np.std; clamp tiny negative rounding error
+        return math.sqrt(max(self.total_sq / len(self.values) - mean * mean, 0.0))
+
+
+class GameSeries:
+    """A player's full game-by-game scoring history with running statistics.
+
+    Every `append` updates the season mean/std (Welford), min/max, each rolling window, the EWMA and the
+    streak counters in O(1), and records the per-game rolling values so the history can be charted.
+    """
+
+    def __init__(self, games=(), windows=DEFAULT_WINDOWS, ewma_span=EWMA_SPAN):
+        self.windows = tuple(sorted(set(windows)))
+        self.alpha = 2 / (ewma_span + 1)
+        self.games = []
+        self.mean = math.nan
+        self.min = math.nan
+        self.max = math.nan
+        self.ewma = math.nan
+        # Consecutive games above (positive) or below (negative) the average going into each game
+        self.streak = 0
+        # Consecutive games scoring more than the game before
+        self.rising = 0
+        self._m2 = 0.0
+        self._rolling = {window: _RollingWindow(window) for window in self.windows}
+        self._history = {"ewma": []}
+        self._history.update({window: [] for window in self.windows})
+        self.extend(games)
+
+    def append(self, points):
+        points = float(points)
+        count = len(self.games) + 1
+
+        if count == 1:
+            self.mean = self.min = self.max = self.ewma = points
+        else:
+            if points > self.mean:
+                self.streak = self.streak + 1 if self.streak > 0 else 1
+            elif points < self.mean:
+                self.streak = self.streak - 1 if self.streak < 0 else -1
+            else:
+                self.streak = 0
+            self.rising = self.rising + 1 if points > self.games[-1] else 0
+            self.min = min(self.min, points)
+            self.max = max(self.max, points)
+            self.ewma += self.alpha * (points - self.ewma)
+            # Welford's update keeps the variance stable over long histories
+            delta = points - self.mean
+            self.mean += delta / count
+            self._m2 += delta * (points - self.mean)
+        self.games.append(points)
+
+        for window, rolling in self._rolling.items():
+            rolling.push(points)
+            self._history[window].append(rolling.mean)
+        self._history["ewma"].append(self.ewma)
+
+    def extend(self, games):
+        for points in games:
+            self.append(points)
+
+    def __len__(self):
+        return len(self.games)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / len(self.games)) if self.games else math.nan
+
+    @property
+    def range(self):
+        return self.max - self.min
+
+    @property
+    def consistency(self):
+        # Same scale as the metrics table: 100 minus the coefficient of variation
+        return 100 - self.std / self.mean * 100 if self.mean else math.nan
+
+    def rolling_mean(self, window):
+        return self._rolling[window].mean
+
+    def rolling_std(self, window):
+        return self._rolling[window].std
+
+    def trend(self, window):
+        # Recent form against the season average; positive means trending up
+        return self.rolling_mean(window) - self.mean
+
+    def is_hot(self, window):
+        return self.rolling_mean(window) > self.mean
+
+    def history(self):
+        # Game-by-game points with the rolling averages and EWMA as they stood after each game
+        # Sliced to one length in case another session is appending to a shared series
+        count = len(self.games)
+        frame = pd.DataFrame({"Points": self.games[:count]}, index=pd.RangeIndex(1, count + 1, name="Game"))
+        for window in self.windows:
+            frame[f"{window}-Game Avg"] = self._history[window][:count]
+        frame["EWMA"] = self._history["ewma"][:count]
+        return frame
+
+
+class GameSeriesCache:
+    """Process-wide LRU of game series by player and windows.
+
+    When a player's log has grown by appended games since it was cached, only the new games are folded in.
+    Game logs are immutable once handed out (PlayerRecord), so the same log object is a hit without reading it.
+    A new log continues the cached series only if it is longer and starts with every cached game, checked in
+    one vectorized comparison; anything else (such as a replaced log) rebuilds the series.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, player_name, games, windows=DEFAULT_WINDOWS, ewma_span=EWMA_SPAN):
+        key = (player_name, tuple(sorted(set(windows))), ewma_span)
+        with self._lock:
+            source, series = self._entries.get(key, (None, None))
+            if source is not games:
+                if (series is None or len(series) >= len(games)
+                        or not np.array_equal(np.asarray(games[:len(series)], dtype=float), series.games)):
+                    series = GameSeries(games, windows, ewma_span)
+                else:
+                    series.extend(games[len(series):])
+            self._entries[key] = (games, series)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return series
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,236 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from google.api_core import exceptions as api_exceptions
+
+# Default model used when none is picked in the sidebar
+DEFAULT_MODEL_NAME = "gemini-1.5-flash"
+
+# genai.configure() swaps process-wide state, so configuring and binding a client must not interleave
+_configure_lock = threading.Lock()
+
+# Marks the end of a streamed response on the chunk queue
+_STREAM_DONE = object()
+
+
+def create_gemini_model(api_key, model_name=DEFAULT_MODEL_NAME, temperature=0.7):
+    # The SDK takes most of a second to import, so it loads with the first model rather than at app start
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+
+    with _configure_lock:
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name, generation_config={"temperature": temperature})
+        # Bind the transport for this key now; otherwise the model picks up whichever key was configured last
+        model._client = genai_client.get_default_generative_client()
+    return model
+
+
+class DispatcherBusyError(Exception):
+    """Raised when the dispatcher queue is full and a request cannot be admitted."""
+
+
+class GeminiTimeoutError(TimeoutError):
+    """Raised when a request (or the gap between streamed chunks) exceeds the timeout."""
+
+
+def is_rate_limit_error(error):
+    if isinstance(error, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)):
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "quota" in message
+
+
+class GeminiDispatcher:
+    """Runs Gemini requests on a bounded thread pool with timeouts, rate-limit retries and backpressure."""
+
+    def __init__(self, max_concurrency=4, max_queue=32, timeout_seconds=60, max_retries=3,
+                 backoff_base=1.0, backoff_max=16.0, admission_timeout=2.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.admission_timeout = admission_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        # Running plus waiting requests can never exceed this many slots
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {"queued": 0, "in_flight": 0, "completed": 0, "failed": 0, "retries": 0, "timeouts": 0, "rejected": 0}
+
+    @property
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    @property
+    def queue_depth(self):
+        with self._stats_lock:
+            return self._stats["queued"]
+
+    def generate(self, model, prompt):
+        future = self._submit(self._generate, model, prompt)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            future.cancel()
+            self._count("timeouts")
+            raise GeminiTimeoutError(f"No response from Gemini within {self.timeout_seconds:g}s")
+
+    def stream(self, model, prompt):
+        chunks = queue.Queue()
+        future = self._submit(self._stream_into, model, prompt, chunks)
+        while True:
+            try:
+                # The timeout applies to each gap between chunks, not the whole answer
+                item = chunks.get(timeout=self.timeout_seconds)
+            except queue.Empty:
+                # A request still waiting in the queue is dropped rather than run for nobody
+                future.cancel()
+                self._count("timeouts")
+                raise GeminiTimeoutError(f"Gemini stopped responding for {self.timeout_seconds:g}s")
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.admission_timeout):
+            self._count("rejected")
+            raise DispatcherBusyError("Too many Gemini requests are already queued")
+        self._count("queued")
+        try:
+            future = self._executor.submit(self._run, fn, *args)
+        except Exception:
+            self._count("queued", -1)
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    def _release_cancelled(self, future):
+        # A request cancelled while queued (timed out, or dropped at shutdown) never reaches _run, so its slot is given back here
+        if future.cancelled():
+            self._count("queued", -1)
+            self._slots.release()
+
+    def _run(self, fn, *args):
+        self._count("queued", -1)
+        self._count("in_flight")
+        try:
+            result = fn(*args)
+            self._count("completed")
+            return result
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            self._count("in_flight", -1)
+            self._slots.release()
+
+    def _generate(self, model, prompt):
+        response = self._with_retries(
+            lambda: model.generate_content(prompt, request_options={"timeout": self.timeout_seconds})
+        )
+        return response.text
+
+    def _stream_into(self, model, prompt, chunks):
+        started = False
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = model.generate_content(prompt, stream=True, request_options={"timeout": self.timeout_seconds})
+                    for chunk in response:
+                        try:
+                            chunk_text = chunk.text
+                        except ValueError:
+                            # Chunks without text parts (e.g. safety metadata) carry nothing to show
+                            continue
+                        started = True
+                        chunks.put(chunk_text)
+                    break
+                except Exception as e:
+                    # Once text has been shown a retry would duplicate it, so only retry before the first chunk
+                    if started or not self._should_retry(e, attempt):
+                        raise
+                    self._backoff(attempt)
+                    attempt += 1
+        except Exception as e:
+            chunks.put(e)
+            raise
+        finally:
+            chunks.put(_STREAM_DONE)
+
+    def _with_retries(self, call):
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                self._backoff(attempt)
+                attempt += 1
+
+    def _should_retry(self, error, attempt):
+        return attempt < self.max_retries and is_rate_limit_error(error)
+
+    def _backoff(self, attempt):
+        self._count("retries")
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        # Jitter keeps sessions that were throttled together from retrying in lockstep
+        time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _count(self, name, delta=1):
+        with self._stats_lock:
+            self._stats[name] += delta
+
+
+class FakeGeminiResponse:
+    """Minimal stand-in for a Gemini response: has .text and iterates as chunks."""
+
+    def __init__(self, text, chunk_size=12, chunk_delay=0.0):
+        self.text = text
+        self._chunk_size = chunk_size
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self):
+        for start in range(0, len(self.text), self._chunk_size):
+            if self._chunk_delay:
+                time.sleep(self._chunk_delay)
+            yield FakeGeminiResponse(self.text[start:start + self._chunk_size])
+
+
+class FakeGeminiModel:
+    """Local stand-in for genai.GenerativeModel with configurable latency and rate-limit failures."""
+
+    def __init__(self, reply="Great basketball question! Consider tracking defensive rating and pace.",
+                 latency=0.0, chunk_delay=0.0, rate_limit_failures=0):
+        self.reply = reply
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.rate_limit_failures = rate_limit_failures
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        with self._lock:
+            self.calls += 1
+            fail = self.rate_limit_failures > 0
+            if fail:
+                self.rate_limit_failures -= 1
+        if fail:
+            raise api_exceptions.ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+        if self.latency:
+            time.sleep(self.latency)
+        return FakeGeminiResponse(self.reply, chunk_delay=self.chunk_delay if stream else 0.0)
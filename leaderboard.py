@@ -0,0 +1,92 @@
+import bisect
+import threading
+
+from player_metrics import build_roster_table, compute_player_metrics
+
+# Above this share of changed players a sync re-rates the whole roster in one vectorized pass
+REBUILD_FRACTION = 0.25
+
+# Players per page of the full leaderboard
+LEADERBOARD_PAGE_SIZE = 25
+
+
+# Function to rate a {name: player dict} roster with the Game Strategy overall rating
+def rate_players(players):
+    if not players:
+        return {}
+    return compute_player_metrics(build_roster_table(players))["overall_rating"].to_dict()
+
+
+def _rank_key(name, rating):
+    # Highest rating first, ties by name; NaN ratings sort after every number
+    return (float("inf") if rating != rating else -rating, name)
+
+
+class Leaderboard:
+    """Players ranked by overall rating, kept in order as the roster changes.
+
+    `sync` re-rates only the players that were added or edited since the last roster version and moves them
+    into place with binary search, so adding or removing one player doesn't re-rate or re-sort everyone.
+    Given the roster's metrics table, ratings are read from its overall_rating column instead of computed again.
+    """
+
+    def __init__(self, rebuild_fraction=REBUILD_FRACTION):
+        self.rebuild_fraction = rebuild_fraction
+        self.version = None
+        self._players = {}
+        self._ratings = {}
+        self._ranking = []
+        self._lock = threading.Lock()
+
+    def sync(self, version, players, metrics=None):
+        with self._lock:
+            if version == self.version:
+                return
+            removed = [name for name in self._players if name not in players]
+            changed = {name: player for name, player in players.items()
+                       if (previous := self._players.get(name)) is not player and previous != player}
+
+            if len(removed) + len(changed) > self.rebuild_fraction * max(len(players), 1):
+                self._rebuild(players, metrics)
+            else:
+                for name in removed:
+                    self._discard(name)
+                ratings = rate_players(changed) if metrics is None else metrics.loc[list(changed), "overall_rating"].to_dict()
+                for name, rating in ratings.items():
+                    self._discard(name)
+                    self._ratings[name] = rating
+                    bisect.insort(self._ranking, _rank_key(name, rating))
+            # Copy so later edits to a caller's dict can't leak into the snapshot
+            self._players = dict(players)
+            self.version = version
+
+    def top(self, n):
+        with self._lock:
+            return [(name, self._ratings[name]) for _, name in self._ranking[:n]]
+
+    def page(self, page, page_size, offset=0):
+        # Ranks are 1-based; `offset` skips the players already shown (e.g. the top-N cards)
+        start = offset + page * page_size
+        with self._lock:
+            return [(rank, name, self._ratings[name])
+                    for rank, (_, name) in enumerate(self._ranking[start:start + page_size], start=start + 1)]
+
+    def rank_of(self, name):
+        with self._lock:
+            if name not in self._ratings:
+                return None
+            return bisect.bisect_left(self._ranking, _rank_key(name, self._ratings[name])) + 1
+
+    def __len__(self):
+        return len(self._ranking)
+
+    def _discard(self, name):
+        if name not in self._ratings:
+            return
+        index = bisect.bisect_left(self._ranking, _rank_key(name, self._ratings.pop(name)))
+        if index < len(self._ranking) and self._ranking[index][1] == name:
+            del self._ranking[index]
+
+    def _rebuild(self, players, metrics=None):
+        self._ratings = rate_players(players) if metrics is None else metrics["overall_rating"].to_dict()
+        self._ranking = sorted(_rank_key(name, rating) for name, rating in self._ratings.items())
@@ -0,0 +1,174 @@
+import functools
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket catches everything slower
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, math.inf)
+
+
+class LatencyHistogram:
+    """Call count, total/min/max and bucketed latencies for one instrumented operation."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms, error=False):
+        self.count += 1
+        self.errors += error
+        self.total_ms += elapsed_ms
+        self.min_ms = min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for index, bound in enumerate(self.buckets):
+            if elapsed_ms <= bound:
+                self.counts[index] += 1
+                break
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of calls (capped at the slowest call seen)
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": self.total_ms,
+            "mean_ms": self.mean_ms,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets": {("+Inf" if math.isinf(bound) else f"{bound:g}"): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+
+class PerformanceRegistry:
+    """Process-wide latency histograms keyed by operation name, shared by every session."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, name, elapsed_ms, error=False):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.observe(elapsed_ms, error)
+
+    @contextmanager
+    def timed(self, name):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, error)
+
+    def timer(self, name=None):
+        # Decorator form of timed(); the operation name defaults to module.function
+        def decorate(func):
+            operation = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(operation):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+    def register_gauge(self, metric, help_text, label, collect):
+        # A gauge read at export time: `collect()` returns {label value: current value}
+        with self._lock:
+            self._gauges[metric] = (help_text, label, collect)
+
+    def gauges(self):
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        return {metric: {"help": help_text, "label": label, "values": collect()} for metric, (help_text, label, collect) in gauges}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def to_json(self):
+        return json.dumps({"started": self.started, "exported": time.time(), "operations": self.snapshot(),
+                           "gauges": {metric: gauge["values"] for metric, gauge in self.gauges().items()}}, indent=2)
+
+    def to_prometheus(self, metric="buzzer_operation_duration_ms"):
+        # Prometheus text exposition format: one histogram series per operation
+        lines = [f"# HELP {metric} Latency of instrumented BUZZER AI operations in milliseconds.", f"# TYPE {metric} histogram"]
+        for name, snapshot in self.snapshot().items():
+            label = re.sub(r'["\\\n]', "_", name)
+            cumulative = 0
+            for bound, count in snapshot["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{operation="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{operation="{label}"}} {snapshot["total_ms"]:.3f}')
+            lines.append(f'{metric}_count{{operation="{label}"}} {snapshot["count"]}')
+        lines.append("# HELP buzzer_operation_errors_total Instrumented operations that raised.")
+        lines.append("# TYPE buzzer_operation_errors_total counter")
+        for name, snapshot in self.snapshot().items():
+            label = re.sub(r'["\\\n]', "_", name)
+            lines.append(f'buzzer_operation_errors_total{{operation="{label}"}} {snapshot["errors"]}')
+        for gauge_metric, gauge in self.gauges().items():
+            lines.append(f"# HELP {gauge_metric} {gauge['help']}")
+            lines.append(f"# TYPE {gauge_metric} gauge")
+            for label_value, value in sorted(gauge["values"].items()):
+                label = re.sub(r'["\\\n]', "_", str(label_value))
+                lines.append(f'{gauge_metric}{{{gauge["label"]}="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        # .json writes the JSON report, anything else the Prometheus text format; written atomically
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return path
+
+
+# The registry every module records into
+registry = PerformanceRegistry()
+timed = registry.timed
+timer = registry.timer
@@ -0,0 +1,152 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from perf_metrics import timer
+
+# Resolution of cached chart images
+CHART_DPI = 100
+
+PLAYER_STAT_FIELDS = ("PPG", "RPG", "APG", "FG%", "3P%", "FT%")
+
+
+class ChartCache:
+    """Process-wide LRU cache of rendered chart PNGs, keyed by chart type and the data drawn."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+
+        # Render outside the lock so one slow chart doesn't block every other session
+        png = render()
+        with self._lock:
+            self._entries[key] = png
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return png
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        with self._lock:
+            return sum(len(png) for png in self._entries.values())
+
+
+# Function to build the cache key for a player's charts from the stats they draw
+def player_chart_key(chart_type, player_name, player_data):
+    return (chart_type, player_name, tuple(player_data[stat] for stat in PLAYER_STAT_FIELDS),
+            tuple(player_data.get("games", ())))
+
+
+# Function to rasterize a figure to PNG bytes and release it
+def figure_to_png(fig):
+    # Figures are built with matplotlib.figure.Figure rather than pyplot, so they never enter
+    # pyplot's global registry; clearing after saving drops every artist right away
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=CHART_DPI)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+# Function to render the player stat visualization as PNG bytes
+@timer("chart.render_player_stats")
+def render_player_stats_png(player_name, player_data):
+    # matplotlib is imported on the first render rather than at app start
+    from matplotlib.figure import Figure
+
+    # Create figure with two subplots
+    fig = Figure(figsize=(12, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Basic stats bar chart
+    basic_stats = ['PPG', 'RPG', 'APG']
+    values = [player_data[stat] for stat in basic_stats]
+    bars = ax1.bar(basic_stats, values, color=['#FF4B4B', '#1890FF', '#52C41A'])
+    ax1.set_title(f"{player_name} - Basic Stats", fontsize=14)
+    ax1.set_ylim(0, max(max(values) * 1.2, 1))
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                 f"{height:.1f}", ha='center', fontsize=11)
+
+    # Shooting percentages
+    shooting_stats = ['FG%', '3P%', 'FT%']
+    shooting_values = [player_data[stat] for stat in shooting_stats]
+    ax2.bar(shooting_stats, shooting_values, color=['#722ED1', '#13C2C2', '#FA8C16'])
+    ax2.set_title(f"{player_name} - Shooting %", fontsize=14)
+    ax2.set_ylim(0, 100)
+
+    # Game log trend line; imported logs can be any length, so the title gives the actual count
+    if 'games' in player_data:
+        ax3 = fig.add_subplot(2, 1, 2)
+        game_count = len(player_data['games'])
+        games = list(range(1, game_count + 1))
+        ax3.plot(games, player_data['games'], marker='o', linestyle='-', color='#FF4B4B', linewidth=2)
+        ax3.set_title(f"{player_name} - Points by Game ({game_count} Game{'' if game_count == 1 else 's'})", fontsize=14)
+        ax3.set_xlabel('Game Number')
+        ax3.set_ylabel('Points')
+        ax3.grid(True, linestyle='--', alpha=0.7)
+
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+
+# Function to draw half-court lines in feet, basket at the origin (the shot_chart coordinate system)
+def draw_half_court(ax, color="#4A5568"):
+    from matplotlib.patches import Arc, Circle, Rectangle
+
+    court = [
+        Circle((0, 0), radius=0.75, fill=False, color=color, linewidth=1.5),          # hoop
+        Rectangle((-3, -1.25), 6, 0, color=color, linewidth=1.5),                      # backboard
+        Rectangle((-8, -5.25), 16, 19, fill=False, color=color, linewidth=1.5),         # paint
+        Arc((0, 13.75), 12, 12, theta1=0, theta2=180, color=color, linewidth=1.5),     # free throw circle
+        Arc((0, 0), 8, 8, theta1=0, theta2=180, color=color, linewidth=1.5),           # restricted area
+        Rectangle((-22, -5.25), 0, 14.2, color=color, linewidth=1.5),                  # corner threes
+        Rectangle((22, -5.25), 0, 14.2, color=color, linewidth=1.5),
+        Arc((0, 0), 47.5, 47.5, theta1=22.2, theta2=157.8, color=color, linewidth=1.5),  # three-point arc
+        Rectangle((-25, -5.25), 50, 47, fill=False, color=color, linewidth=1.5),        # baseline, sidelines, half court
+    ]
+    for element in court:
+        ax.add_patch(element)
+    ax.set_xlim(-25.5, 25.5)
+    ax.set_ylim(-6, 42.5)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+
+# Function to render a player's hex-binned shot chart as PNG bytes: hex size is volume, colour is FG%
+@timer("chart.render_shot_chart")
+def render_shot_chart_png(player_name, hex_bins):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 7.5))
+    ax = fig.subplots()
+    draw_half_court(ax)
+    if len(hex_bins.attempts):
+        sizes = 30 + 270 * hex_bins.attempts / hex_bins.attempts.max()
+        efficiency = 100 * hex_bins.makes / hex_bins.attempts
+        points = ax.scatter(hex_bins.x, hex_bins.y, s=sizes, c=efficiency, cmap="RdYlGn", vmin=20, vmax=70,
+                            marker="h", edgecolors="white", linewidths=0.5)
+        fig.colorbar(points, ax=ax, shrink=0.6, label="FG%")
+    ax.set_title(f"{player_name}'s Shot Chart ({int(hex_bins.attempts.sum())} shots)")
+    fig.tight_layout()
+    return figure_to_png(fig)
@@ -0,0 +1,158 @@
+import threading
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from player_record import STAT_ATTRIBUTES, PlayerRecord
+
+STAT_FIELDS = list(STAT_ATTRIBUTES)
+
+# Games counted as "recent" for trend and hot-streak checks
+RECENT_GAMES = 3
+
+# Columnar view of a roster: one row per player, game logs as a NaN-padded 2-D array
+RosterTable = namedtuple("RosterTable", ["names", "stats", "positions", "games", "game_counts"])
+
+# Metrics shown side by side in the group comparison view
+COMPARISON_METRICS = ["scoring", "playmaking", "rebounding", "shooting_skill", "ts_percentage", "efficiency",
+                      "total_impact", "game_mean", "consistency", "overall_rating"]
+
+# Largest group compared at once; the pairwise differences grow with the square of the group
+COMPARISON_MAX_PLAYERS = 50
+
+# N-way comparison: the players x metrics table, and differences[i, j, m] = table[i, m] - table[j, m]
+PlayerComparison = namedtuple("PlayerComparison", ["table", "differences"])
+
+# Above this share of changed players RosterMetrics recomputes the whole roster in one pass
+METRICS_REBUILD_FRACTION = 0.25
+
+
+# Function to lay out a {name: player dict} roster as columns
+def build_roster_table(players):
+    names = list(players.keys())
+    # PlayerRecords hand over their stats as one tuple instead of six key lookups
+    stats = np.array([data.stats if isinstance(data, PlayerRecord) else [data[stat] for stat in STAT_FIELDS] for data in players.values()],
+                     dtype=float).reshape(len(names), len(STAT_FIELDS))
+    positions = [data.get("position") for data in players.values()]
+
+    game_logs = [data.get("games", ()) for data in players.values()]
+    game_counts = np.fromiter(map(len, game_logs), dtype=int, count=len(game_logs))
+    games = np.full((len(names), max(game_counts.max(initial=0), 1)), np.nan)
+    # Every log laid end to end fills the padded rows left to right in one assignment
+    # (concatenated as arrays, so packed and memory-mapped logs are copied in bulk rather than value by value)
+    if game_counts.sum():
+        games[np.arange(games.shape[1]) < game_counts[:, None]] = np.concatenate([np.asarray(log, dtype=float) for log in game_logs])
+
+    return RosterTable(names, pd.DataFrame(stats, index=names, columns=STAT_FIELDS), positions, games, game_counts)
+
+
+# Function to summarize the last `window` games of every player (mean and std), whatever their log length
+def recent_game_summary(games, game_counts, window=RECENT_GAMES):
+    offsets = game_counts[:, None] - window + np.arange(window)
+    valid = offsets >= 0
+    recent = np.where(valid, np.take_along_axis(games, np.clip(offsets, 0, None), axis=1), np.nan)
+    return np.nanmean(recent, axis=1), np.nanstd(recent, axis=1)
+
+
+# Function to compute every derived player metric in one vectorized pass
+def compute_player_metrics(roster):
+    stats = roster.stats
+    ppg, rpg, apg = stats["PPG"].to_numpy(), stats["RPG"].to_numpy(), stats["APG"].to_numpy()
+    fg, three, ft = stats["FG%"].to_numpy(), stats["3P%"].to_numpy(), stats["FT%"].to_numpy()
+
+    # Players without games (or zero averages) yield NaN/inf rather than warnings
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        game_mean = np.nanmean(roster.games, axis=1)
+        game_std = np.nanstd(roster.games, axis=1)
+        variation = game_std / game_mean * 100
+        recent_mean, recent_std = recent_game_summary(roster.games, roster.game_counts)
+
+        metrics = pd.DataFrame({
+            # Elite skill ratings (0-100)
+            "scoring": np.minimum(ppg / 35 * 100, 100),
+            "playmaking": np.minimum(apg / 12 * 100, 100),
+            "rebounding": np.minimum(rpg / 15 * 100, 100),
+            "shooting_skill": np.minimum(fg / 65 * 100, 100),
+            "consistency_skill": np.clip(100 - game_std / np.maximum(game_mean, 0.001) * 100, 0, 100),
+            # Advanced performance metrics
+            "ts_percentage": ppg / (2 * (fg / 100 * 10 + ft / 100 * 4)) * 100,
+            "versatility": (ppg / 30 + rpg / 10 + apg / 10) * 10,
+            "impact_score": ppg * 0.4 + rpg * 0.3 + apg * 0.3,
+            "efficiency": (fg + three + ft) / 3,
+            # Head-to-head comparison inputs
+            "shooting_efficiency": (fg + three) / 2,
+            "total_impact": ppg + rpg + apg,
+            # Game log summary
+            "game_mean": game_mean,
+            "game_std": game_std,
+            "game_min": np.nanmin(roster.games, axis=1),
+            "game_max": np.nanmax(roster.games, axis=1),
+            "recent_mean": recent_mean,
+            "recent_std": recent_std,
+            "consistency": 100 - variation,
+            # Overall rating used by the Game Strategy tab
+            "overall_rating": (ppg * 0.3 + (fg + three + ft) / 3 * 0.2 + (rpg + apg) * 0.25 + (100 - variation) * 0.25),
+        }, index=stats.index)
+
+    metrics["game_range"] = metrics["game_max"] - metrics["game_min"]
+    metrics["hot_streak"] = metrics["recent_mean"] > metrics["game_mean"]
+    return metrics
+
+
+class RosterMetrics:
+    """compute_player_metrics for a changing roster, recomputing only the rows of added or edited players.
+
+    Every metric depends on one player's stats and games alone, so unchanged rows are carried over as they are.
+    Each sync returns a new table; tables handed out earlier are never modified.
+    """
+
+    def __init__(self, rebuild_fraction=METRICS_REBUILD_FRACTION):
+        self.rebuild_fraction = rebuild_fraction
+        self.version = None
+        self.metrics = None
+        self._players = {}
+        self._lock = threading.Lock()
+
+    def sync(self, version, players):
+        with self._lock:
+            if version == self.version:
+                return self.metrics
+            # Shared records are usually the same object, which is checked before comparing values
+            changed = {name: player for name, player in players.items()
+                       if (previous := self._players.get(name)) is not player and previous != player}
+            removed = sum(1 for name in self._players if name not in players)
+
+            if self.metrics is None or len(changed) + removed > self.rebuild_fraction * max(len(players), 1):
+                metrics = compute_player_metrics(build_roster_table(players))
+            elif changed or removed:
+                edited = [name for name in changed if name in self._players]
+                metrics = self.metrics.drop(index=edited) if edited else self.metrics
+                if changed:
+                    metrics = pd.concat([metrics, compute_player_metrics(build_roster_table(changed))])
+                # Back in roster order, without the removed players (added players usually already sit at the end)
+                names = list(players)
+                if removed or metrics.index.tolist() != names:
+                    metrics = metrics.reindex(names)
+            else:
+                metrics = self.metrics
+            # Copy so later edits to a caller's dict can't leak into the snapshot
+            self._players = dict(players)
+            self.metrics = metrics
+            self.version = version
+            return metrics
+
+
+# Function to compare any number of players on every comparison metric in one broadcast
+def compare_players(metrics, names, columns=COMPARISON_METRICS):
+    table = metrics.loc[list(names), columns]
+    values = table.to_numpy(dtype=float)
+    return PlayerComparison(table, values[:, None, :] - values[None, :, :])
+
+
+# Function to get one metric's pairwise differences as a players x players table (row minus column)
+def pairwise_differences(comparison, metric):
+    names = comparison.table.index
+    return pd.DataFrame(comparison.differences[:, :, comparison.table.columns.get_loc(metric)], index=names, columns=names)
@@ -0,0 +1,127 @@
+from array import array
+from collections.abc import Mapping
+from operator import attrgetter
+
+# Stat keys of a player and the record attribute holding each
+STAT_ATTRIBUTES = {"PPG": "ppg", "RPG": "rpg", "APG": "apg", "FG%": "fg_pct", "3P%": "three_pct", "FT%": "ft_pct"}
+
+_read_stats = attrgetter(*STAT_ATTRIBUTES.values())
+
+# Game logs are stored as 4-byte floats: whole points are exact and any fractional import values survive
+GAMES_TYPECODE = "f"
+
+
+class PlayerRecord(Mapping):
+    """Immutable player stats with the game log in a packed array.
+
+    Reads like the player dicts used everywhere else (`player["PPG"]`, `player.get("position")`,
+    `player["games"]`), so a roster of records can be shared by every session and rerun without copying.
+    """
+
+    __slots__ = ("ppg", "rpg", "apg", "fg_pct", "three_pct", "ft_pct", "games", "position")
+
+    def __init__(self, ppg, rpg, apg, fg_pct, three_pct, ft_pct, games=(), position=None):
+        for attribute, value in zip(self.__slots__, (ppg, rpg, apg, fg_pct, three_pct, ft_pct)):
+            object.__setattr__(self, attribute, float(value))
+        # Packed float32 logs (arrays, or NumPy views such as a memory-mapped game log) are kept as they are
+        if not (isinstance(games, array) and games.typecode == GAMES_TYPECODE or getattr(games, "dtype", None) == "float32"):
+            games = array(GAMES_TYPECODE, games)
+        object.__setattr__(self, "games", games)
+        object.__setattr__(self, "position", position)
+
+    @classmethod
+    def from_mapping(cls, player):
+        # Records pass through unchanged; they can't be edited, so sharing them is safe
+        if isinstance(player, cls):
+            return player
+        return cls(*(player[stat] for stat in STAT_ATTRIBUTES), player.get("games", ()), player.get("position"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PlayerRecord is immutable")
+
+    def __getitem__(self, key):
+        attribute = STAT_ATTRIBUTES.get(key)
+        if attribute is not None:
+            return object.__getattribute__(self, attribute)
+        if key == "games":
+            return self.games
+        if key == "position" and self.position is not None:
+            return self.position
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from STAT_ATTRIBUTES
+        yield "games"
+        if self.position is not None:
+            yield "position"
+
+    def __len__(self):
+        return len(STAT_ATTRIBUTES) + 1 + (self.position is not None)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, PlayerRecord):
+            # Both game logs are packed float32, so comparing their bytes compares every game
+            return (all(getattr(self, attribute) == getattr(other, attribute) for attribute in self.__slots__ if attribute != "games")
+                    and len(self.games) == len(other.games) and memoryview(self.games).tobytes() == memoryview(other.games).tobytes())
+        if isinstance(other, Mapping):
+            # Against a plain player dict, whatever sequence type its game log is in
+            return self.to_dict() == {**other, "games": list(other.get("games", ()))}
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, attribute) for attribute in self.__slots__))
+
+    def __repr__(self):
+        return f"PlayerRecord({dict(self.items())!r})"
+
+    @property
+    def stats(self):
+        # The six season averages in STAT_ATTRIBUTES order, read straight from the slots
+        return _read_stats(self)
+
+    def to_dict(self):
+        # Plain dict form, with the game log as a list (e.g. for JSON)
+        player = dict(self.items())
+        player["games"] = self.games.tolist()
+        return player
+
+
+class Roster(Mapping):
+    """Read-only {name: PlayerRecord} mapping, built once per roster change and shared by every session.
+
+    `names` is the player list in roster order, so widgets don't rebuild it from the keys on every rerun.
+    """
+
+    __slots__ = ("_players", "names")
+
+    def __init__(self, players=()):
+        self._players = {name: PlayerRecord.from_mapping(player) for name, player in dict(players).items()}
+        self.names = tuple(self._players)
+
+    def __getitem__(self, name):
+        return self._players[name]
+
+    def __iter__(self):
+        return iter(self._players)
+
+    def __len__(self):
+        return len(self._players)
+
+    def __contains__(self, name):
+        return name in self._players
+
+    def get(self, name, default=None):
+        return self._players.get(name, default)
+
+    def keys(self):
+        return self._players.keys()
+
+    def values(self):
+        return self._players.values()
+
+    def items(self):
+        return self._players.items()
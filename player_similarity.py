@@ -0,0 +1,132 @@
+import warnings
+
+import numpy as np
+
+from player_metrics import STAT_FIELDS
+
+# Game-log shape features from the player metrics table, used alongside the six season averages
+SHAPE_FEATURES = ["game_mean", "game_std", "game_range", "recent_mean"]
+
+# Candidate rows scored per matrix product; bounds the temporary score matrix for batched queries
+SCORE_BLOCK_ROWS = 16384
+
+# Rosters at least this large get the approximate (clustered) index by default
+APPROXIMATE_MIN_PLAYERS = 20000
+
+
+# Function to turn the metrics table into standardized, unit-length player vectors
+def build_feature_matrix(players, metrics):
+    stats = np.array([[data[stat] for stat in STAT_FIELDS] for data in players.values()], dtype=float).reshape(len(players), len(STAT_FIELDS))
+    features = np.hstack([stats, metrics[SHAPE_FEATURES].to_numpy(dtype=float)])
+    # Columns with no values at all (no game logs anywhere) yield NaN rather than warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(features, axis=0) if len(features) else 0.0
+        std = np.nanstd(features, axis=0) if len(features) else 1.0
+    # z-scores so PPG doesn't drown out percentages; missing game logs count as average
+    features = np.nan_to_num((features - mean) / np.where(std > 0, std, 1.0))
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return (features / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+def _top_k(scores, k):
+    # Best k columns of every row, highest first, without sorting whole rows
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((len(scores), 0), dtype=int)
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < scores.shape[1] else np.tile(np.arange(k), (len(scores), 1))
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1)
+
+
+class SimilarityIndex:
+    """Cosine k-nearest-neighbour search over player stat vectors.
+
+    Queries are answered with blocked matrix products over the whole normalized matrix. With
+    `approximate=True` the rows are also grouped into clusters and each query only scores the players in
+    its `probes` closest clusters, which trades a little recall for far fewer products on large rosters.
+    """
+
+    def __init__(self, names, vectors, approximate=False, probes=8, seed=0):
+        self.names = list(names)
+        self.vectors = vectors
+        self.positions = {name: row for row, name in enumerate(self.names)}
+        self.probes = probes
+        self.centroids = None
+        self.members = None
+        if approximate and len(self.names) > 1:
+            self._build_clusters(seed)
+
+    @classmethod
+    def from_metrics(cls, players, metrics, approximate=None, **kwargs):
+        # `metrics` must be compute_player_metrics output for `players`, in the same order
+        if approximate is None:
+            approximate = len(metrics) >= APPROXIMATE_MIN_PLAYERS
+        return cls(metrics.index, build_feature_matrix(players, metrics), approximate=approximate, **kwargs)
+
+    @property
+    def approximate(self):
+        return self.centroids is not None
+
+    def __len__(self):
+        return len(self.names)
+
+    def neighbours(self, names, k=5):
+        # Returns, for each query player, up to k (name, similarity) pairs, excluding the player itself
+        rows = np.array([self.positions[name] for name in names], dtype=int)
+        if self.approximate:
+            results = [self._neighbours_approximate(row, k) for row in rows]
+        else:
+            results = self._neighbours_exact(rows, k)
+        return [[(self.names[col], float(score)) for col, score in result] for result in results]
+
+    def _neighbours_exact(self, rows, k):
+        queries = self.vectors[rows]
+        best_cols = np.empty((len(rows), 0), dtype=int)
+        best_scores = np.empty((len(rows), 0), dtype=np.float32)
+        for start in range(0, len(self.vectors), SCORE_BLOCK_ROWS):
+            scores = queries @ self.vectors[start:start + SCORE_BLOCK_ROWS].T
+            # A player is never its own neighbour
+            own = (rows >= start) & (rows < start + len(scores[0]))
+            scores[own, rows[own] - start] = -np.inf
+            block_best = _top_k(scores, k)
+            # Merge this block's winners with the running best
+            best_cols = np.hstack([best_cols, block_best + start])
+            best_scores = np.hstack([best_scores, np.take_along_axis(scores, block_best, axis=1)])
+            keep = _top_k(best_scores, k)
+            best_cols = np.take_along_axis(best_cols, keep, axis=1)
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        return [[(col, score) for col, score in zip(cols, scores) if np.isfinite(score)]
+                for cols, scores in zip(best_cols, best_scores)]
+
+    def _neighbours_approximate(self, row, k):
+        query = self.vectors[row]
+        clusters = _top_k((self.centroids @ query)[None, :], self.probes)[0]
+        candidates = np.concatenate([self.members[cluster] for cluster in clusters])
+        candidates = candidates[candidates != row]
+        scores = self.vectors[candidates] @ query
+        best = _top_k(scores[None, :], k)[0]
+        return list(zip(candidates[best], scores[best]))
+
+    def _build_clusters(self, seed, iterations=5):
+        # Spherical k-means with about sqrt(n) clusters, assignments done with the same matrix products
+        rng = np.random.default_rng(seed)
+        count = max(1, int(np.sqrt(len(self.vectors))))
+        centroids = self.vectors[rng.choice(len(self.vectors), count, replace=False)]
+        for _ in range(iterations):
+            assignment = self._assign(centroids)
+            sums = np.column_stack([np.bincount(assignment, weights=column, minlength=count) for column in self.vectors.T])
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centre
+            centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids).astype(np.float32)
+        assignment = self._assign(centroids)
+        order = np.argsort(assignment, kind="stable")
+        boundaries = np.cumsum(np.bincount(assignment, minlength=count))[:-1]
+        self.centroids = centroids
+        self.members = np.split(order, boundaries)
+
+    def _assign(self, centroids):
+        assignment = np.empty(len(self.vectors), dtype=int)
+        for start in range(0, len(self.vectors), SCORE_BLOCK_ROWS):
+            assignment[start:start + SCORE_BLOCK_ROWS] = np.argmax(self.vectors[start:start + SCORE_BLOCK_ROWS] @ centroids.T, axis=1)
+        return assignment
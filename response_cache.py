@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# Function to encode one history entry for fingerprinting
+def fingerprint_entry(entry):
+    return f"{entry['role']}\x1f{entry['content']}\x1e".encode("utf-8")
+
+
+# Function to fingerprint a chat history; histories that keep a running fingerprint supply their own
+def history_fingerprint(history):
+    if hasattr(history, "fingerprint"):
+        return history.fingerprint()
+    digest = hashlib.sha256()
+    for entry in history:
+        digest.update(fingerprint_entry(entry))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of model responses with a TTL and optional JSON file persistence."""
+
+    def __init__(self, max_entries=256, ttl_seconds=24 * 60 * 60, persist_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, response)
+        self._lock = threading.Lock()
+        # The file is written outside _lock, one writer at a time; _changes numbers snapshots so an older one never overwrites a newer
+        self._save_lock = threading.Lock()
+        self._changes = 0
+        self._saved_changes = 0
+        if persist_path:
+            self._load()
+
+    @staticmethod
+    def normalize_question(question):
+        # Case, spacing and trailing punctuation don't change what is being asked
+        question = " ".join(question.lower().split())
+        return re.sub(r"[\s?!.]+$", "", question)
+
+    @staticmethod
+    def make_key(question, system_prompt, temperature, history, model_name=""):
+        key_parts = [
+            model_name,
+            ResponseCache.normalize_question(question),
+            system_prompt.strip(),
+            f"{float(temperature):.2f}",
+            history_fingerprint(history),
+        ]
+        return hashlib.sha256("\x00".join(key_parts).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _load(self):
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, stored_at, response in stored[-self.max_entries:]:
+            if now - stored_at <= self.ttl_seconds:
+                self._entries[key] = (stored_at, response)
+
+    def _snapshot(self):
+        # Called under _lock: a copy of the entries to persist, so lookups don't wait for the disk write
+        if not self.persist_path:
+            return None
+        self._changes += 1
+        return self._changes, [[key, stored_at, response] for key, (stored_at, response) in self._entries.items()]
+
+    def _save(self, snapshot):
+        if snapshot is None:
+            return
+        changes, stored = snapshot
+        with self._save_lock:
+            if changes <= self._saved_changes:
+                return
+            # Write to a temp file first so a crash never leaves a half-written cache behind
+            temp_path = f"{self.persist_path}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(stored, f)
+                os.replace(temp_path, self.persist_path)
+            except OSError:
+                return
+            self._saved_changes = changes
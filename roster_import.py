@@ -0,0 +1,166 @@
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from roster_store import validate_player
+
+# Rows read from an import file at a time
+IMPORT_CHUNK_ROWS = 10000
+
+# Accepted column spellings, mapped to the roster's field names
+COLUMN_ALIASES = {
+    "name": "name", "player": "name", "player_name": "name",
+    "position": "position", "pos": "position",
+    "ppg": "PPG", "pts": "PPG", "points_per_game": "PPG",
+    "rpg": "RPG", "reb": "RPG", "rebounds_per_game": "RPG",
+    "apg": "APG", "ast": "APG", "assists_per_game": "APG",
+    "fg%": "FG%", "fg_pct": "FG%",
+    "3p%": "3P%", "3p_pct": "3P%", "three_pct": "3P%",
+    "ft%": "FT%", "ft_pct": "FT%",
+    "games": "games",
+}
+
+# Accepted column spellings for per-game log files
+GAME_LOG_ALIASES = {
+    "name": "name", "player": "name", "player_name": "name",
+    "points": "points", "pts": "points",
+    "game": "game", "game_number": "game", "date": "game", "game_date": "game",
+}
+
+AVERAGE_FIELDS = ["PPG", "RPG", "APG", "FG%", "3P%", "FT%"]
+
+# Summary of a bulk import: how much was read, what was loaded, what was rejected and how fast
+ImportReport = namedtuple("ImportReport", ["rows", "players_loaded", "games_loaded", "errors", "seconds", "rows_per_second"])
+
+
+class RosterImportError(ValueError):
+    """Raised when an import file can't be read at all (unknown format, missing columns)."""
+
+
+# Function to stream a CSV or Parquet file as DataFrame chunks with normalized column names
+def iter_import_chunks(source, aliases, file_name=None, chunk_rows=IMPORT_CHUNK_ROWS):
+    file_name = file_name or getattr(source, "name", None) or str(source)
+    extension = os.path.splitext(file_name)[1].lower()
+
+    if extension == ".csv":
+        chunks = pd.read_csv(source, chunksize=chunk_rows, skipinitialspace=True)
+    elif extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RosterImportError("Parquet import needs the pyarrow package (pip install pyarrow)")
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows))
+    else:
+        raise RosterImportError(f"Unsupported file type '{extension or file_name}': use .csv or .parquet")
+
+    for chunk in chunks:
+        columns = {column: aliases.get(str(column).strip().lower()) for column in chunk.columns}
+        yield chunk.rename(columns=columns)[[column for column in columns.values() if column]]
+
+
+# Function to parse an inline game log ("31;28;35" or "31,28,35") into a list of points
+def parse_games(value):
+    if isinstance(value, (list, tuple)) or hasattr(value, "tolist"):
+        return [float(points) for points in value]
+    if value is None or pd.isna(value) or str(value).strip() == "":
+        return []
+    return [float(points) for points in str(value).replace(",", ";").split(";") if points.strip()]
+
+
+# Function to read season averages into {name: player dict}, validating nothing yet
+def read_averages(source, file_name=None, chunk_rows=IMPORT_CHUNK_ROWS):
+    players = {}
+    errors = []
+    rows = 0
+    for chunk in iter_import_chunks(source, COLUMN_ALIASES, file_name, chunk_rows):
+        missing = [column for column in ["name"] + AVERAGE_FIELDS if column not in chunk.columns]
+        if missing:
+            raise RosterImportError(f"Averages file is missing columns: {', '.join(missing)}")
+
+        averages = chunk[AVERAGE_FIELDS].apply(pd.to_numeric, errors="coerce")
+        numeric = averages.notna().all(axis=1).tolist()
+        names = chunk["name"].astype("string").str.strip().fillna("").tolist()
+        positions = chunk["position"].tolist() if "position" in chunk.columns else [None] * len(chunk)
+        games = chunk["games"].tolist() if "games" in chunk.columns else [None] * len(chunk)
+
+        for offset, (name, values, position, game_log) in enumerate(
+                zip(names, averages.itertuples(index=False, name=None), positions, games)):
+            row_number = rows + offset + 2  # header is line 1
+            if not numeric[offset]:
+                errors.append(f"Row {row_number}: non-numeric season average")
+                continue
+            try:
+                game_log = parse_games(game_log)
+            except ValueError:
+                errors.append(f"Row {row_number}: unreadable games list")
+                continue
+            player = dict(zip(AVERAGE_FIELDS, values))
+            player["games"] = game_log
+            if position is not None and not pd.isna(position):
+                player["position"] = str(position).strip()
+            players[name] = player
+        rows += len(chunk)
+    return players, errors, rows
+
+
+# Function to read per-game logs into {name: [points, ...]}, in game order when a game column is given
+def read_game_logs(source, file_name=None, chunk_rows=IMPORT_CHUNK_ROWS):
+    chunks = []
+    rows = 0
+    for chunk in iter_import_chunks(source, GAME_LOG_ALIASES, file_name, chunk_rows):
+        missing = [column for column in ("name", "points") if column not in chunk.columns]
+        if missing:
+            raise RosterImportError(f"Game log file is missing columns: {', '.join(missing)}")
+        chunk = chunk.assign(name=chunk["name"].astype("string").str.strip(),
+                             points=pd.to_numeric(chunk["points"], errors="coerce"))
+        chunks.append(chunk[[column for column in ("name", "points", "game") if column in chunk.columns]])
+        rows += len(chunk)
+
+    if not chunks:
+        return {}, rows
+    logs = pd.concat(chunks, ignore_index=True).dropna(subset=["name", "points"])
+    if "game" in logs.columns:
+        logs = logs.sort_values("game", kind="stable")
+
+    # Group every player's games in one pass: factorize names, stable-sort by player, split at the boundaries
+    codes, names = pd.factorize(logs["name"])
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.cumsum(np.bincount(codes, minlength=len(names)))[:-1]
+    points = np.split(logs["points"].to_numpy(dtype=float)[order], boundaries)
+    return {name: games.tolist() for name, games in zip(names, points)}, rows
+
+
+# Function to import averages (and optional game logs) into the roster store in one batch
+def import_roster(roster_store, averages_source, game_log_source=None, averages_name=None, game_log_name=None,
+                  chunk_rows=IMPORT_CHUNK_ROWS):
+    start = time.perf_counter()
+    players, errors, rows = read_averages(averages_source, averages_name, chunk_rows)
+
+    if game_log_source is not None:
+        logs, log_rows = read_game_logs(game_log_source, game_log_name, chunk_rows)
+        rows += log_rows
+        for name, games in logs.items():
+            if name in players:
+                # Logged games replace any inline list; logs can be any length
+                players[name]["games"] = games
+            else:
+                errors.append(f"Game log for unknown player '{name}' skipped")
+
+    # Same rules as the "Add New Player" form
+    valid = {}
+    for name, player in players.items():
+        player_errors = validate_player(name, player)
+        if player_errors:
+            errors.extend(f"{name or '(no name)'}: {error}" for error in player_errors)
+        else:
+            valid[name] = player
+
+    if valid:
+        roster_store.add_players(valid)
+
+    seconds = time.perf_counter() - start
+    return ImportReport(rows, len(valid), sum(len(player["games"]) for player in valid.values()), errors, seconds,
+                        rows / seconds if seconds > 0 else float(rows))
@@ -0,0 +1,251 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from player_record import PlayerRecord, Roster
+
+# Allowed ranges, matching the limits of the "Add New Player" form inputs
+STAT_LIMITS = {"PPG": 50.0, "RPG": 25.0, "APG": 15.0, "FG%": 100.0, "3P%": 100.0, "FT%": 100.0}
+GAME_POINTS_LIMIT = 100
+
+STAT_COLUMNS = {"PPG": "ppg", "RPG": "rpg", "APG": "apg", "FG%": "fg_pct", "3P%": "three_pct", "FT%": "ft_pct"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    position TEXT,
+    ppg REAL NOT NULL,
+    rpg REAL NOT NULL,
+    apg REAL NOT NULL,
+    fg_pct REAL NOT NULL,
+    three_pct REAL NOT NULL,
+    ft_pct REAL NOT NULL,
+    games TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_name_nocase ON players (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_players_position ON players (position);
+"""
+
+
+# Function to check a player against the rules of the "Add New Player" form; returns a list of error messages
+def validate_player(name, player):
+    error_messages = []
+
+    if not name:
+        error_messages.append("Player Name is required")
+
+    if player["PPG"] == 0 and player["RPG"] == 0 and player["APG"] == 0:
+        error_messages.append("At least one statistical category (PPG, RPG, APG) must have a value greater than 0")
+
+    if all(game == 0 for game in player["games"]):
+        error_messages.append("Please enter at least one game performance")
+
+    for stat, limit in STAT_LIMITS.items():
+        if not 0 <= player[stat] <= limit:
+            error_messages.append(f"{stat} must be between 0 and {limit:g}")
+
+    if any(not 0 <= game <= GAME_POINTS_LIMIT for game in player["games"]):
+        error_messages.append(f"Game points must be between 0 and {GAME_POINTS_LIMIT}")
+
+    return error_messages
+
+
+def _row_to_player(row, games=None):
+    # `games` comes from the game log store when there is one; otherwise the row's JSON list is used
+    name, position, ppg, rpg, apg, fg_pct, three_pct, ft_pct, stored_games = row
+    return name, PlayerRecord(ppg, rpg, apg, fg_pct, three_pct, ft_pct, json.loads(stored_games) if games is None else games, position)
+
+
+def _player_to_row(name, player, games_in_row=True):
+    games = json.dumps(list(player["games"])) if games_in_row else "[]"
+    return (name, player.get("position"), *(player[stat] for stat in STAT_COLUMNS), games)
+
+
+class RosterStore:
+    """SQLite-backed roster shared by every session, with a process-wide read cache invalidated on write.
+
+    Built-in players (the sample roster) are served alongside stored ones but never written to disk.
+    Players come back as immutable PlayerRecords and rosters as read-only Rosters, shared between sessions;
+    a refresh reuses the record of every player whose row is unchanged.
+
+    With a GameLogStore, stored players' games live there instead of in the database, and each record's
+    game log is a zero-copy view of the memory-mapped files. Existing JSON game lists are moved over on open.
+    """
+
+    def __init__(self, path, base_players=None, game_logs=None):
+        self.path = path
+        self.base_players = {name: PlayerRecord.from_mapping(player) for name, player in (base_players or {}).items()}
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._writes = 0
+        self._in_batch = False
+        self._cache_version = None
+        self._rows = {}
+        self._stored_players = Roster()
+        self._all_players = Roster(self.base_players)
+        self.game_logs = game_logs
+        if game_logs is not None:
+            self._move_games_to_log_store()
+
+    @property
+    def version(self):
+        # Changes whenever this process writes or another connection commits to the database
+        with self._lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if self.game_logs is not None:
+                return f"{data_version}.{self._writes}.{self.game_logs.version}"
+            return f"{data_version}.{self._writes}"
+
+    def all_players(self):
+        self._refresh()
+        return self._all_players
+
+    def snapshot(self):
+        # (version, all players) read as one pair, so callers can key caches on a version that matches the roster
+        with self._lock:
+            self._refresh()
+            return self._cache_version, self._all_players
+
+    def stored_players(self):
+        self._refresh()
+        return self._stored_players
+
+    def get_player(self, name):
+        if name in self.base_players:
+            return self.base_players[name]
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM players WHERE name = ?", (name,)).fetchone()
+        return self._record(row)[1] if row else None
+
+    def find_player(self, name):
+        # Case-insensitive lookup through the NOCASE name index
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM players WHERE name = ? COLLATE NOCASE", (name,)).fetchone()
+        return self._record(row) if row else None
+
+    def players_by_position(self, position):
+        with self._lock:
+            rows = self._connection.execute("SELECT * FROM players WHERE position = ? ORDER BY rowid", (position,)).fetchall()
+        stored = dict(self._record(row) for row in rows)
+        base = {name: player for name, player in self.base_players.items() if player.get("position") == position}
+        return {**base, **stored}
+
+    @contextmanager
+    def batch(self):
+        # Group several writes into one transaction and one cache invalidation
+        with self._lock:
+            if self._in_batch:
+                yield self
+                return
+            self._in_batch = True
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            finally:
+                self._in_batch = False
+                self._writes += 1
+
+    def add_players(self, players):
+        if self.game_logs is None:
+            with self.batch():
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [_player_to_row(name, player) for name, player in players.items()]
+                )
+            return
+        with self.batch(), self.game_logs.batch():
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_player_to_row(name, player, games_in_row=False) for name, player in players.items()]
+            )
+            for name, player in players.items():
+                self.game_logs.replace(name, player["games"])
+
+    def add_player(self, name, player):
+        self.add_players({name: player})
+
+    def remove_players(self, names):
+        with self.batch():
+            self._connection.executemany("DELETE FROM players WHERE name = ?", [(name,) for name in names])
+            if self.game_logs is not None:
+                self.game_logs.remove(names)
+
+    def append_games(self, name, games):
+        # Add newly played games to the end of a stored player's log; with a game log store nothing else is rewritten
+        with self.batch():
+            row = self._connection.execute("SELECT * FROM players WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(f"'{name}' is not a stored player")
+            if self.game_logs is not None:
+                self.game_logs.append(name, games)
+            else:
+                self._connection.execute("UPDATE players SET games = ? WHERE name = ?",
+                                         (json.dumps(json.loads(row[-1]) + list(games)), name))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+            if self.game_logs is not None:
+                self.game_logs.close()
+
+    def _record(self, row):
+        if self.game_logs is None:
+            return _row_to_player(row)
+        return _row_to_player(row, self.game_logs.games(row[0]))
+
+    def _move_games_to_log_store(self):
+        # One-time move of game lists kept in the database (from before the game log store was used)
+        with self._lock:
+            rows = self._connection.execute("SELECT name, games FROM players WHERE games != '[]'").fetchall()
+        if not rows:
+            return
+        with self.batch(), self.game_logs.batch():
+            for name, games in rows:
+                self.game_logs.replace(name, json.loads(games))
+            self._connection.executemany("UPDATE players SET games = '[]' WHERE name = ?", [(name,) for name, _ in rows])
+
+    def _refresh(self):
+        with self._lock:
+            version = self.version
+            if version == self._cache_version:
+                return
+            while True:
+                rows = self._connection.execute("SELECT * FROM players ORDER BY rowid").fetchall()
+                # A player's extent in the game log store changes whenever their games do
+                extents = self.game_logs.extents() if self.game_logs is not None else {}
+                # Another connection may have committed while reading; read again so the roster matches `version`
+                latest = self.version
+                if latest == version:
+                    break
+                version = latest
+            previous = self._rows
+            self._rows = {}
+            stored_players = {}
+            changed = []
+            for row in rows:
+                key = (row, extents.get(row[0]))
+                cached = previous.get(row[0])
+                # Unchanged rows keep their record, so an edit to one player doesn't rebuild everyone's
+                if cached is not None and cached[0] == key:
+                    player = cached[1]
+                else:
+                    player = None
+                    changed.append(row)
+                self._rows[row[0]] = (key, player)
+                stored_players[row[0]] = player
+            games = self.game_logs.games_for([row[0] for row in changed]) if self.game_logs is not None else {}
+            for row in changed:
+                name, player = _row_to_player(row, games.get(row[0]))
+                self._rows[name] = (self._rows[name][0], player)
+                stored_players[name] = player
+            self._stored_players = Roster(stored_players)
+            # Built once per roster change; every rerun in every session reuses this mapping instead of copying it
+            self._all_players = Roster({**self.base_players, **stored_players})
+            self._cache_version = version
@@ -0,0 +1,326 @@
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+
+from response_cache import fingerprint_entry
+
+# Messages each session keeps in memory before the oldest are written to the spill store
+MAX_RESIDENT_MESSAGES = 200
+
+# Messages written per spilled page
+SPILL_PAGE_MESSAGES = 50
+
+# Spilled pages kept in memory after being read back, per session
+PAGE_CACHE_PAGES = 2
+
+# Sessions untouched for this long have everything they hold in memory spilled
+IDLE_EVICT_SECONDS = 30 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    session TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (session, page)
+);
+"""
+
+
+def _message_bytes(message):
+    # Approximate memory held by one message dict and its values
+    return sys.getsizeof(message) + sum(sys.getsizeof(value) for value in message.values())
+
+
+class SpillStore:
+    """SQLite file of zlib-compressed JSON pages of chat messages, keyed by session and page number.
+
+    Spilled pages only live as long as the server process, so the file is emptied when the store opens
+    and deleted when the process exits.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._remove_files()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        atexit.register(self.remove)
+
+    def write_page(self, session, page, messages):
+        data = zlib.compress(json.dumps(messages, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (session, page, data))
+        return len(data)
+
+    def read_page(self, session, page):
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM pages WHERE session = ? AND page = ?", (session, page)).fetchone()
+        if row is None:
+            raise KeyError(f"spilled page {page} of session {session} is missing")
+        return json.loads(zlib.decompress(row[0]))
+
+    def delete_session(self, session):
+        with self._lock:
+            # Histories collected after the store closed (e.g. at exit) have nothing left to delete
+            if self._closed:
+                return
+            self._connection.execute("DELETE FROM pages WHERE session = ?", (session,))
+
+    def spilled_bytes(self):
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._connection.close()
+
+    def remove(self):
+        # Close and delete the file along with its WAL files
+        self.close()
+        self._remove_files()
+
+    def _remove_files(self):
+        for path in (self.path, f"{self.path}-wal", f"{self.path}-shm"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class ChatHistory:
+    """One session's chat history: the latest messages in memory, older ones in the spill store.
+
+    Behaves like a list of message dicts (len, indexing, slicing, iteration, append). Spilled pages are
+    read back only when a slice or index reaches them. `rendered` holds per-message output derived from
+    the history (such as chat HTML) and is dropped along with the messages when the session is evicted.
+    """
+
+    def __init__(self, spill_store, max_resident=MAX_RESIDENT_MESSAGES, page_messages=SPILL_PAGE_MESSAGES):
+        self.session = uuid.uuid4().hex[:12]
+        self.max_resident = max_resident
+        self.page_messages = max(1, min(page_messages, max_resident))
+        self.rendered = {}
+        self.last_seen = time.time()
+        self._store = spill_store
+        self._lock = threading.RLock()
+        # Messages from index self._spilled onwards
+        self._resident = []
+        self._resident_bytes = 0
+        # Cumulative message count at the end of each spilled page
+        self._page_ends = []
+        self._page_cache = OrderedDict()
+        # Running fingerprint of the whole history, plus the fingerprints at the last few lengths
+        self._digest = hashlib.sha256()
+        self._fingerprints = OrderedDict()
+        # Spilled pages belong to this object; drop them when it is cleared or garbage collected
+        self._finalizer = weakref.finalize(self, spill_store.delete_session, self.session)
+
+    @property
+    def _spilled(self):
+        return self._page_ends[-1] if self._page_ends else 0
+
+    @property
+    def spilled_messages(self):
+        return self._spilled
+
+    def __len__(self):
+        return self._spilled + len(self._resident)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        # Page by page, so at most one spilled page is read in at a time
+        for page in range(len(self._page_ends)):
+            yield from self._read_page(page)
+        yield from list(self._resident)
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                start, stop, step = index.indices(len(self))
+                if step != 1:
+                    return [self[position] for position in range(start, stop, step)]
+                return self._range(start, stop)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("chat history index out of range")
+            return self._range(index, index + 1)[0]
+
+    def prefix(self, count):
+        # Lazy view of the first `count` messages (e.g. the history before the question being answered)
+        return HistoryView(self, count)
+
+    def append(self, message):
+        with self._lock:
+            self._resident.append(message)
+            self._resident_bytes += _message_bytes(message)
+            self._digest.update(fingerprint_entry(message))
+            self._fingerprints[len(self)] = self._digest.hexdigest()
+            while len(self._fingerprints) > 4:
+                self._fingerprints.popitem(last=False)
+            # Keep the newest messages resident; full pages of the oldest go to disk
+            while len(self._resident) > self.max_resident:
+                self._spill(self.page_messages)
+
+    def fingerprint(self, count=None):
+        # Same value response_cache.history_fingerprint computes for the first `count` messages
+        with self._lock:
+            count = len(self) if count is None else count
+            if count == len(self):
+                return self._digest.hexdigest()
+            if count in self._fingerprints:
+                return self._fingerprints[count]
+            digest = hashlib.sha256()
+            for message in HistoryView(self, count):
+                digest.update(fingerprint_entry(message))
+            return digest.hexdigest()
+
+    @property
+    def resident_bytes(self):
+        cached = sum(_message_bytes(message) for messages in self._page_cache.values() for message in messages)
+        rendered = sum(sys.getsizeof(value) for value in self.rendered.values())
+        return self._resident_bytes + cached + rendered
+
+    def evict(self):
+        # Spill everything held in memory; the next read pages it back in
+        with self._lock:
+            if self._resident:
+                self._spill(len(self._resident))
+            self._page_cache.clear()
+            self.rendered.clear()
+
+    def close(self):
+        self._finalizer()
+
+    def _spill(self, count):
+        messages = self._resident[:count]
+        self._store.write_page(self.session, len(self._page_ends), messages)
+        self._page_ends.append(self._spilled + len(messages))
+        del self._resident[:count]
+        self._resident_bytes -= sum(_message_bytes(message) for message in messages)
+        for message in messages:
+            self.rendered.pop(message.get("id"), None)
+
+    def _read_page(self, page):
+        messages = self._page_cache.get(page)
+        if messages is None:
+            messages = self._store.read_page(self.session, page)
+            self._page_cache[page] = messages
+            while len(self._page_cache) > PAGE_CACHE_PAGES:
+                self._page_cache.popitem(last=False)
+        self._page_cache.move_to_end(page)
+        return messages
+
+    def _range(self, start, stop):
+        if start >= stop:
+            return []
+        spilled = self._spilled
+        messages = []
+        if start < spilled:
+            # Only the pages overlapping [start, stop) are read
+            first = bisect.bisect_right(self._page_ends, start)
+            last = bisect.bisect_left(self._page_ends, min(stop, spilled))
+            for page in range(first, last + 1):
+                page_start = self._page_ends[page - 1] if page else 0
+                page_messages = self._read_page(page)
+                messages.extend(page_messages[max(start - page_start, 0):min(stop, spilled) - page_start])
+        if stop > spilled:
+            messages.extend(self._resident[max(start - spilled, 0):stop - spilled])
+        return messages
+
+
+class HistoryView:
+    """The first `count` messages of a ChatHistory, read through to it without copying."""
+
+    def __init__(self, history, count):
+        self.history = history
+        self.count = min(count, len(history))
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        for position, message in enumerate(self.history):
+            if position >= self.count:
+                return
+            yield message
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.history[slice(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("chat history index out of range")
+        return self.history[index]
+
+    def fingerprint(self):
+        return self.history.fingerprint(self.count)
+
+
+class SessionMemoryManager:
+    """Process-wide registry of session chat histories: creates them, evicts idle ones and reports memory.
+
+    Sessions are held weakly, so a history Streamlit has dropped is forgotten and its spilled pages deleted.
+    """
+
+    def __init__(self, spill_path, max_resident=MAX_RESIDENT_MESSAGES, idle_seconds=IDLE_EVICT_SECONDS, sweep_seconds=60):
+        self.store = SpillStore(spill_path)
+        self.max_resident = max_resident
+        self.idle_seconds = idle_seconds
+        self.sweep_seconds = sweep_seconds
+        self.evictions = 0
+        self._sessions = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    def new_history(self):
+        history = ChatHistory(self.store, self.max_resident)
+        with self._lock:
+            self._sessions[history.session] = history
+        return history
+
+    def touch(self, history):
+        # Called on every run of a session; also evicts other sessions that have gone idle, at most once per sweep
+        now = time.time()
+        history.last_seen = now
+        if now - self._last_sweep >= self.sweep_seconds:
+            self.evict_idle(now)
+
+    def evict_idle(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            idle = [history for history in self._sessions.values()
+                    if now - history.last_seen > self.idle_seconds and history.resident_bytes]
+        for history in idle:
+            history.evict()
+        self.evictions += len(idle)
+        return len(idle)
+
+    def resident_bytes(self):
+        # Memory held by each live session's history, by session id
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {history.session: history.resident_bytes for history in sessions}
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,274 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from roster_import import IMPORT_CHUNK_ROWS, RosterImportError, iter_import_chunks
+
+# Shot coordinates are in feet with the basket at (0, 0): x runs sideline to sideline, y from the baseline
+# (-5.25) towards half court (41.75). Shots beyond half court are binned at its edge.
+COURT_X_LIMITS = (-25.0, 25.0)
+COURT_Y_LIMITS = (-5.25, 41.75)
+
+# Court geometry used to classify zones
+THREE_POINT_RADIUS = 23.75
+CORNER_THREE_X = 22.0
+CORNER_THREE_Y = 8.95  # where the straight corner line meets the arc
+RESTRICTED_AREA_RADIUS = 4.0
+PAINT_HALF_WIDTH = 8.0
+PAINT_LENGTH = 13.75  # free throw line, 19 ft from the baseline
+
+ZONES = ["Restricted Area", "Paint", "Mid-Range", "Corner 3", "Above the Break 3"]
+
+# Distance between neighbouring hex centres along x, in feet
+HEX_SPACING = 2.0
+
+# Accepted column spellings for shot log files
+SHOT_LOG_ALIASES = {
+    "name": "name", "player": "name", "player_name": "name",
+    "x": "x", "shot_x": "x",
+    "y": "y", "shot_y": "y",
+    "made": "made", "shot_made": "made", "shot_made_flag": "made", "result": "made",
+    "game": "game", "game_id": "game",
+}
+
+# Values of the made column that count as a make; anything else is a miss
+MADE_VALUES = ["1", "1.0", "true", "t", "yes", "y", "made", "make"]
+
+# Summary of a shot log import, like roster_import.ImportReport
+ShotImportReport = namedtuple("ShotImportReport", ["rows", "shots_loaded", "players_loaded", "errors", "seconds", "rows_per_second"])
+
+# Occupied hex bins of one player: centres, attempts and makes, one entry per bin
+HexBins = namedtuple("HexBins", ["x", "y", "attempts", "makes"])
+
+
+# Function to classify shots into ZONES (as indexes), all at once
+def classify_zones(x, y):
+    distance = np.hypot(x, y)
+    zones = np.full(len(x), ZONES.index("Mid-Range"), dtype=np.int8)
+    zones[(np.abs(x) < PAINT_HALF_WIDTH) & (y < PAINT_LENGTH)] = ZONES.index("Paint")
+    zones[distance < RESTRICTED_AREA_RADIUS] = ZONES.index("Restricted Area")
+    zones[distance >= THREE_POINT_RADIUS] = ZONES.index("Above the Break 3")
+    zones[(np.abs(x) >= CORNER_THREE_X) & (y <= CORNER_THREE_Y)] = ZONES.index("Corner 3")
+    return zones
+
+
+class HexGrid:
+    """Regular hexagonal bins over the half court, as two offset rectangular lattices.
+
+    A shot goes to whichever of its nearest centres in the two lattices is closer (the same construction
+    as matplotlib's hexbin), so binning any number of shots is a handful of array operations.
+    """
+
+    def __init__(self, spacing=HEX_SPACING, x_limits=COURT_X_LIMITS, y_limits=COURT_Y_LIMITS):
+        self.x_min, self.x_max = x_limits
+        self.y_min, self.y_max = y_limits
+        self.sx = spacing
+        self.sy = spacing * np.sqrt(3)
+        self.nx = int(np.ceil((self.x_max - self.x_min) / self.sx))
+        self.ny = int(np.ceil((self.y_max - self.y_min) / self.sy))
+        # Lattice 1 has (nx + 1) x (ny + 1) centres on the grid points, lattice 2 nx x ny centres in the cells
+        lattice1 = np.mgrid[0:self.nx + 1, 0:self.ny + 1].reshape(2, -1)
+        lattice2 = np.mgrid[0:self.nx, 0:self.ny].reshape(2, -1) + 0.5
+        centres = np.hstack([lattice1, lattice2])
+        self.centre_x = self.x_min + centres[0] * self.sx
+        self.centre_y = self.y_min + centres[1] * self.sy
+
+    def __len__(self):
+        return len(self.centre_x)
+
+    def bin_index(self, x, y):
+        x = (np.clip(x, self.x_min, self.x_max) - self.x_min) / self.sx
+        y = (np.clip(y, self.y_min, self.y_max) - self.y_min) / self.sy
+        ix1, iy1 = np.rint(x), np.rint(y)
+        ix2, iy2 = np.floor(x), np.floor(y)
+        # Distances in lattice units; y is scaled so both lattices are regular hexagons
+        nearer_first = (x - ix1) ** 2 + 3 * (y - iy1) ** 2 < (x - ix2 - 0.5) ** 2 + 3 * (y - iy2 - 0.5) ** 2
+        ix2, iy2 = np.minimum(ix2, self.nx - 1), np.minimum(iy2, self.ny - 1)
+        first = ix1 * (self.ny + 1) + iy1
+        second = (self.nx + 1) * (self.ny + 1) + ix2 * self.ny + iy2
+        return np.where(nearer_first, first, second).astype(np.intp)
+
+
+class ShotLog:
+    """Every imported shot, stored column-wise and grouped by player so one player's shots are a slice.
+
+    Attempts and makes per zone are counted for all players in one pass when the log is built.
+    """
+
+    def __init__(self, names=(), counts=(), x=(), y=(), made=(), game=()):
+        self.names = list(names)
+        self.positions = {name: index for index, name in enumerate(self.names)}
+        self.offsets = np.concatenate([[0], np.cumsum(np.asarray(counts, dtype=np.int64))]).astype(np.int64)
+        self.x = np.asarray(x, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.float32)
+        self.made = np.asarray(made, dtype=bool)
+        self.game = np.asarray(game, dtype=np.int64)
+        self.zones = classify_zones(self.x, self.y)
+
+        players = np.repeat(np.arange(len(self.names)), np.diff(self.offsets))
+        key = players * len(ZONES) + self.zones
+        size = len(self.names) * len(ZONES)
+        self.zone_attempts = np.bincount(key, minlength=size).reshape(len(self.names), len(ZONES))
+        self.zone_makes = np.bincount(key, weights=self.made, minlength=size).astype(np.int64).reshape(len(self.names), len(ZONES))
+
+    @classmethod
+    def from_columns(cls, names, x, y, made, game):
+        # Group shots by player, keeping each player's shots in log order
+        codes, unique_names = pd.factorize(np.asarray(names, dtype=object))
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(unique_names))
+        return cls(unique_names, counts, np.asarray(x)[order], np.asarray(y)[order], np.asarray(made)[order], np.asarray(game)[order])
+
+    def __len__(self):
+        return len(self.x)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def player_slice(self, name):
+        index = self.positions[name]
+        return slice(self.offsets[index], self.offsets[index + 1])
+
+    def zone_summary(self, name):
+        # Zone -> (attempts, makes) for one player; a row of the precomputed table
+        index = self.positions[name]
+        return {zone: (int(attempts), int(makes))
+                for zone, attempts, makes in zip(ZONES, self.zone_attempts[index], self.zone_makes[index])}
+
+    def games_played(self, name):
+        return len(np.unique(self.game[self.player_slice(name)]))
+
+    def hex_bins(self, name, grid):
+        shots = self.player_slice(name)
+        bins = grid.bin_index(self.x[shots], self.y[shots])
+        attempts = np.bincount(bins, minlength=len(grid))
+        makes = np.bincount(bins, weights=self.made[shots], minlength=len(grid))
+        occupied = np.flatnonzero(attempts)
+        return HexBins(grid.centre_x[occupied], grid.centre_y[occupied], attempts[occupied], makes[occupied].astype(np.int64))
+
+    def merge(self, other):
+        # Shots in `other` replace the same player's shots from the same games; every other shot is kept,
+        # so a season can be loaded one game file at a time
+        if not self.names:
+            return other
+        if not other.names:
+            return self
+        names = self.names + [name for name in other.names if name not in self.positions]
+        positions = {name: index for index, name in enumerate(names)}
+        own_players = np.repeat(np.arange(len(self.names)), np.diff(self.offsets))
+        new_players = np.repeat(np.array([positions[name] for name in other.names], dtype=np.intp), np.diff(other.offsets))
+
+        # (player, game) pairs as single integers, with games numbered over both logs
+        game_codes, games = pd.factorize(np.concatenate([self.game, other.game]))
+        own_pairs = own_players * len(games) + game_codes[:len(self.game)]
+        new_pairs = new_players * len(games) + game_codes[len(self.game):]
+        keep = ~np.isin(own_pairs, new_pairs)
+
+        players = np.concatenate([own_players[keep], new_players])
+        # Stable, so each player's kept shots come first, then the imported ones, each in log order
+        order = np.argsort(players, kind="stable")
+        columns = [np.concatenate([getattr(self, column)[keep], getattr(other, column)])[order] for column in ("x", "y", "made", "game")]
+        return ShotLog(names, np.bincount(players, minlength=len(names)), *columns)
+
+    def save(self, path):
+        # Written to a temp file and swapped in, so a crash never leaves a half-written log
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, names=np.array(self.names, dtype=str), counts=np.diff(self.offsets),
+                 x=self.x, y=self.y, made=self.made, game=self.game)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["names"].tolist(), data["counts"], data["x"], data["y"], data["made"], data["game"])
+
+
+# Function to read a shot log file into a ShotLog, skipping rows that can't be placed on the court
+def read_shot_log(source, file_name=None, chunk_rows=IMPORT_CHUNK_ROWS):
+    columns = {"name": [], "x": [], "y": [], "made": [], "game": []}
+    rows = 0
+    skipped = 0
+    for chunk in iter_import_chunks(source, SHOT_LOG_ALIASES, file_name, chunk_rows):
+        missing = [column for column in ("name", "x", "y", "made") if column not in chunk.columns]
+        if missing:
+            raise RosterImportError(f"Shot log file is missing columns: {', '.join(missing)}")
+        names = chunk["name"].astype("string").str.strip()
+        x = pd.to_numeric(chunk["x"], errors="coerce")
+        y = pd.to_numeric(chunk["y"], errors="coerce")
+        valid = (names.notna() & (names != "") & x.notna() & y.notna()).to_numpy()
+        made = chunk["made"].astype("string").str.strip().str.lower().isin(MADE_VALUES).to_numpy()
+        game = (pd.to_numeric(chunk["game"], errors="coerce").fillna(0) if "game" in chunk.columns
+                else pd.Series(0, index=chunk.index)).to_numpy(dtype=np.int64)
+
+        columns["name"].append(names.to_numpy(dtype=object)[valid])
+        columns["x"].append(x.to_numpy(dtype=np.float32)[valid])
+        columns["y"].append(y.to_numpy(dtype=np.float32)[valid])
+        columns["made"].append(made[valid])
+        columns["game"].append(game[valid])
+        skipped += int((~valid).sum())
+        rows += len(chunk)
+
+    if not rows:
+        return ShotLog(), rows, skipped
+    return ShotLog.from_columns(*(np.concatenate(parts) for parts in columns.values())), rows, skipped
+
+
+class ShotChartStore:
+    """Shot logs shared by every session, persisted to an .npz file, with per-player hex bins cached.
+
+    Zone tables are computed when a log is imported; hex bins are computed the first time a player's
+    chart is drawn and kept until the next import.
+    """
+
+    def __init__(self, path=None, grid=None, max_cached_players=256):
+        self.path = path
+        self.grid = grid or HexGrid()
+        self.max_cached_players = max_cached_players
+        self.version = 0
+        self._hex_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.log = ShotLog()
+        if path and os.path.exists(path):
+            self.log = ShotLog.load(path)
+
+    def __contains__(self, name):
+        return name in self.log
+
+    def zone_summary(self, name):
+        return self.log.zone_summary(name)
+
+    def games_played(self, name):
+        return self.log.games_played(name)
+
+    def hex_bins(self, name):
+        with self._lock:
+            bins = self._hex_cache.get(name)
+            if bins is not None:
+                self._hex_cache.move_to_end(name)
+                return bins
+            log = self.log
+        bins = log.hex_bins(name, self.grid)
+        with self._lock:
+            if log is self.log:
+                self._hex_cache[name] = bins
+                while len(self._hex_cache) > self.max_cached_players:
+                    self._hex_cache.popitem(last=False)
+        return bins
+
+    def import_shot_log(self, source, file_name=None, chunk_rows=IMPORT_CHUNK_ROWS):
+        start = time.perf_counter()
+        imported, rows, skipped = read_shot_log(source, file_name, chunk_rows)
+        with self._lock:
+            self.log = self.log.merge(imported)
+            self.version += 1
+            self._hex_cache.clear()
+            if self.path:
+                self.log.save(self.path)
+        errors = [f"{skipped} rows with a missing name or non-numeric coordinates skipped"] if skipped else []
+        seconds = time.perf_counter() - start
+        return ShotImportReport(rows, len(imported), len(imported.names), errors, seconds,
+                                rows / seconds if seconds > 0 else float(rows))
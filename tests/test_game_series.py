@@ -0,0 +1,25 @@
+import unittest
+from array import array
+
+from game_series import GameSeriesCache
+
+
+class GameSeriesCacheTests(unittest.TestCase):
+
+    def test_appended_games_extend_the_cached_series(self):
+        cache = GameSeriesCache()
+        series = cache.get("Player", array("f", [10, 20, 30]))
+        extended = cache.get("Player", array("f", [10, 20, 30, 40]))
+        self.assertIs(extended, series)
+        self.assertEqual(extended.games, [10.0, 20.0, 30.0, 40.0])
+
+    def test_replaced_log_is_rebuilt_even_when_the_last_cached_game_matches(self):
+        cache = GameSeriesCache()
+        cache.get("Player", array("f", [10, 20, 30]))
+        series = cache.get("Player", array("f", [45, 45, 30, 40]))
+        self.assertEqual(series.games, [45.0, 45.0, 30.0, 40.0])
+        self.assertEqual(series.mean, 40.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
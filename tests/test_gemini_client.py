@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+
+from google.api_core import exceptions as api_exceptions
+
+from gemini_client import DispatcherBusyError, FakeGeminiModel, GeminiDispatcher, GeminiTimeoutError
+
+
+# Function to wait until no request is running or queued on the dispatcher
+def wait_until_idle(dispatcher, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        stats = dispatcher.stats
+        if not stats["in_flight"] and not stats["queued"]:
+            return stats
+        time.sleep(0.01)
+    return dispatcher.stats
+
+
+# Function to call dispatcher.generate from several threads at once; returns each call's result or exception
+def generate_concurrently(dispatcher, model, count):
+    outcomes = [None] * count
+
+    def call(index):
+        try:
+            outcomes[index] = dispatcher.generate(model, f"question {index}")
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+class GeminiDispatcherTests(unittest.TestCase):
+
+    def make_dispatcher(self, **options):
+        dispatcher = GeminiDispatcher(**{"backoff_base": 0.001, "backoff_max": 0.01, **options})
+        self.addCleanup(dispatcher.shutdown)
+        return dispatcher
+
+    def test_generate_returns_model_reply(self):
+        dispatcher = self.make_dispatcher()
+        model = FakeGeminiModel(reply="Run more pick and roll.")
+        self.assertEqual(dispatcher.generate(model, "What should we run?"), "Run more pick and roll.")
+        self.assertEqual(wait_until_idle(dispatcher)["completed"], 1)
+
+    def test_stream_yields_the_whole_reply(self):
+        dispatcher = self.make_dispatcher()
+        model = FakeGeminiModel(reply="Switch everything on defense and push the pace after misses.")
+        self.assertEqual("".join(dispatcher.stream(model, "Defense?")), model.reply)
+
+    def test_timeout_raises(self):
+        dispatcher = self.make_dispatcher(timeout_seconds=0.1)
+        with self.assertRaises(GeminiTimeoutError):
+            dispatcher.generate(FakeGeminiModel(latency=0.5), "Slow question")
+        stats = wait_until_idle(dispatcher)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_requests_timed_out_in_queue_give_back_their_slots(self):
+        dispatcher = self.make_dispatcher(max_concurrency=1, max_queue=2, timeout_seconds=0.2, admission_timeout=0.01)
+        outcomes = generate_concurrently(dispatcher, FakeGeminiModel(latency=0.5), 3)
+        self.assertTrue(all(isinstance(outcome, GeminiTimeoutError) for outcome in outcomes))
+        stats = wait_until_idle(dispatcher)
+        self.assertEqual((stats["queued"], stats["in_flight"]), (0, 0))
+        # Every slot is free again, so a full batch is admitted without waiting
+        outcomes = generate_concurrently(dispatcher, FakeGeminiModel(latency=0.05), 3)
+        self.assertFalse([outcome for outcome in outcomes if isinstance(outcome, Exception)])
+
+    def test_stream_timed_out_in_queue_gives_back_its_slot(self):
+        dispatcher = self.make_dispatcher(max_concurrency=1, max_queue=1, timeout_seconds=0.2, admission_timeout=0.01)
+        blocker = threading.Thread(target=generate_concurrently, args=(dispatcher, FakeGeminiModel(latency=0.5), 1))
+        blocker.start()
+        time.sleep(0.05)
+        with self.assertRaises(GeminiTimeoutError):
+            list(dispatcher.stream(FakeGeminiModel(), "Queued behind a slow request"))
+        blocker.join()
+        stats = wait_until_idle(dispatcher)
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(dispatcher.generate(FakeGeminiModel(reply="ok"), "again"), "ok")
+
+    def test_rate_limited_requests_are_retried(self):
+        dispatcher = self.make_dispatcher(max_retries=3)
+        model = FakeGeminiModel(reply="Eventually answered.", rate_limit_failures=2)
+        self.assertEqual(dispatcher.generate(model, "Busy API"), "Eventually answered.")
+        self.assertEqual(model.calls, 3)
+        self.assertEqual(wait_until_idle(dispatcher)["retries"], 2)
+
+    def test_rate_limit_beyond_max_retries_is_raised(self):
+        dispatcher = self.make_dispatcher(max_retries=1)
+        model = FakeGeminiModel(rate_limit_failures=5)
+        with self.assertRaises(api_exceptions.ResourceExhausted):
+            dispatcher.generate(model, "Still busy")
+        self.assertEqual(model.calls, 2)
+        self.assertEqual(wait_until_idle(dispatcher)["failed"], 1)
+
+    def test_full_queue_rejects_new_requests(self):
+        dispatcher = self.make_dispatcher(max_concurrency=1, max_queue=0, admission_timeout=0.05)
+        blocker = threading.Thread(target=generate_concurrently, args=(dispatcher, FakeGeminiModel(latency=0.3), 1))
+        blocker.start()
+        time.sleep(0.05)
+        with self.assertRaises(DispatcherBusyError):
+            dispatcher.generate(FakeGeminiModel(), "One too many")
+        blocker.join()
+        self.assertEqual(wait_until_idle(dispatcher)["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()